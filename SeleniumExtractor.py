@@ -5,9 +5,13 @@ SeleniumExtractor module for retrieving and processing web content from URLs usi
 This module uses a real browser to bypass anti-scraping measures and extract content from websites.
 """
 
+import asyncio
 import time
-import re
-from typing import List, Dict, Optional, Tuple
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Tuple
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -15,10 +19,36 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
-from markdownify import markdownify as md
-from vector_db import process_markdown_content
+from html_parsers import resolve_parser
+from page_renderer import extract_content, render_page, to_markdown
+from parse_workers import ParsePool, default_parse_workers
+from boilerplate_detector import BoilerplateDetector
+from browser_extraction import extract_in_browser
+from driver_pool import DriverPool
+from tab_pool import TabFactory, TAB_BROWSER_ARGUMENTS
+from memory_watchdog import MemoryWatchdog
+from latency_tracker import LatencyTracker
+from driver_resolver import resolve_chromedriver
+from http_fetcher import HttpFetcher, DEFAULT_USER_AGENT
+from document_extractor import document_type, pdf_to_html, text_to_html
+from resource_blocking import ResourceBlocker, DEFAULT_BLOCKED_TYPES
+from page_cache import PageCache
+from politeness import HostScheduler
+from url_registry import UrlRegistry, canonicalize_url
+from page_readiness import install_readiness_instrumentation, wait_until_ready
+
+
+# Number of fetches of a host needed before its slow pages are hedged
+HEDGE_MIN_SAMPLES = 5
+
+# Make native lazy-loaded elements load right away and scroll to a position,
+# returning the document height so the caller can tell when it stops growing
+LAZY_SCROLL_JS = """
+document.querySelectorAll('[loading="lazy"]').forEach(function (e) { e.loading = 'eager'; });
+window.scrollTo(0, arguments[0]);
+return Math.max(document.body.scrollHeight, document.documentElement.scrollHeight);
+"""
 
 
 class SeleniumExtractor:
@@ -32,29 +62,134 @@ class SeleniumExtractor:
                  timeout: int = 30,
                  max_content_length: int = 20000,  # Increased from 5000 to 20000
                  wait_time: int = 3,
-                 scroll_page: bool = True):
+                 scroll_page: bool = True,
+                 pool_size: int = 1,
+                 http_first: bool = True,
+                 quiet_period: float = 0.5,
+                 scroll_budget: float = 1.0,
+                 scroll_jumps: int = 5,
+                 max_pages_per_driver: int = 50,
+                 driver_path: Optional[str] = None,
+                 blocked_resources: Optional[List[str]] = None,
+                 resource_overrides: Optional[Dict[str, List[str]]] = None,
+                 cache_dir: Optional[str] = None,
+                 cache_ttl: float = 24 * 3600,
+                 max_per_host: int = 2,
+                 requests_per_second: float = 2.0,
+                 parser: Optional[str] = None,
+                 parse_workers: Optional[int] = None,
+                 parse_timeout: float = 30,
+                 strip_boilerplate: bool = True,
+                 boilerplate_file: Optional[str] = None,
+                 in_browser_extraction: bool = False,
+                 tabs_per_browser: int = 1,
+                 max_browser_memory_mb: Optional[float] = 1536,
+                 hedge_requests: bool = True):
         """
         Initialize the SeleniumExtractor.
         
         Args:
             headless: Whether to run browser in headless mode
             timeout: Timeout for page loads in seconds
-            max_content_length: Maximum length of content to extract from each page
-            wait_time: Time to wait after page load for dynamic content to render
+            max_content_length: Maximum number of text characters extracted from each page; text
+                extraction and markdown conversion stop once it is reached
+            wait_time: Maximum time to wait after page load for dynamic content to render
             scroll_page: Whether to scroll the page to load lazy-loaded content
+            pool_size: Number of pages loaded concurrently in the browser by process_urls
+            http_first: Whether to try a plain HTTP request before starting a browser
+            quiet_period: Time without DOM or network activity after which a page is considered ready
+            scroll_budget: Maximum time spent scrolling a page to trigger lazy loading, in seconds
+            scroll_jumps: Number of jumps used to go from the top to the bottom of a page
+            max_pages_per_driver: Number of pages after which a browser is restarted (0 disables recycling)
+            driver_path: Path to a ChromeDriver binary (defaults to $CHROMEDRIVER_PATH or a cached download)
+            blocked_resources: Resource types the browser must not load ("image", "font", "media",
+                "tracker"); defaults to all of them, pass an empty list to load everything
+            resource_overrides: Resource types allowed again per domain, e.g. {"example.org": ["image"]}
+            cache_dir: Directory of the on-disk page cache (None disables caching)
+            cache_ttl: Time in seconds during which a cached page is used without revalidation
+            max_per_host: Maximum number of concurrent requests to the same host
+            requests_per_second: Sustained request rate allowed per host (robots.txt crawl-delay
+                and 429/503 backoff can slow it down further)
+            parser: HTML parser backend ("lxml", "html5lib" or "html.parser"); defaults to
+                the fastest one installed
+            parse_workers: Number of processes used to parse pages and convert them to markdown
+                (defaults to one per core, up to 4; 0 parses in the fetching threads)
+            parse_timeout: Maximum time in seconds spent parsing and converting one page
+            strip_boilerplate: Whether to remove blocks repeated across pages of the same domain
+            boilerplate_file: JSON file where repeated blocks are remembered between runs
+                (None keeps them for the lifetime of the extractor)
+            in_browser_extraction: Whether pages loaded in the browser are reduced to their title,
+                headings and main content by a script run in the page, instead of transferring
+                the whole page source (the reduced page is also what gets cached)
+            tabs_per_browser: Number of pages a browser loads at the same time in separate tabs;
+                above 1, pool_size pages are spread over pool_size / tabs_per_browser browsers
+            max_browser_memory_mb: Memory of a browser's process tree, in MB, above which it is
+                restarted after the current page (None disables it, memory is still recorded
+                in page_metrics)
+            hedge_requests: Whether a browser load running longer than the 90th percentile of
+                its host's browser loads is raced against a plain HTTP request of the same page
         """
         self.headless = headless
         self.timeout = timeout
         self.max_content_length = max_content_length
+        self.parser = resolve_parser(parser)
         self.wait_time = wait_time
         self.scroll_page = scroll_page
-        self.driver = None
+        self.in_browser_extraction = in_browser_extraction
+        self.quiet_period = quiet_period
+        self.scroll_budget = scroll_budget
+        self.scroll_jumps = max(1, scroll_jumps)
+        self.driver_path = driver_path
+        self._blocker = ResourceBlocker(
+            DEFAULT_BLOCKED_TYPES if blocked_resources is None else blocked_resources,
+            domain_overrides=resource_overrides,
+        )
+        self.pool_size = max(1, pool_size)
+        self.tabs_per_browser = max(1, tabs_per_browser)
+        self._tabs: Optional[TabFactory] = None
+        if self.tabs_per_browser > 1:
+            # The pool hands out tabs, packed into as few browsers as possible
+            self._tabs = TabFactory(self._create_browser, self._prepare_page,
+                                    tabs_per_browser=self.tabs_per_browser,
+                                    max_pages_per_browser=max_pages_per_driver * self.tabs_per_browser,
+                                    page_load_timeout=timeout)
+        self._pool = DriverPool(self._tabs or self._create_driver, size=self.pool_size,
+                                max_pages_per_driver=max_pages_per_driver)
+        self._watchdog = MemoryWatchdog(max_browser_memory_mb)
+        self.http_first = http_first
+        self._http = HttpFetcher(timeout=timeout, pool_maxsize=max(10, self.pool_size))
+        self.page_cache = PageCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+        # Results of the URLs processed in this session, by canonical URL
+        self._registry = UrlRegistry()
+        self.scheduler = HostScheduler(max_per_host=max_per_host,
+                                       requests_per_second=requests_per_second,
+                                       http=self._http)
+        # Per-URL measurements of the last fetch (method, time spent waiting, ...)
+        self.page_metrics: Dict[str, Dict] = {}
+        # Recent fetch times per host, to estimate what a URL will cost
+        self.latency = LatencyTracker()
+        # Recent browser load times per host, the reference for hedging browser loads
+        self.browser_latency = LatencyTracker()
+        self.hedge_requests = hedge_requests
+        # Executors backing the async API, created on first use
+        self._browser_executor: Optional[ThreadPoolExecutor] = None
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Guards the leases shared between browser fetches and _abort_browser_fetch
+        self._lease_lock = threading.Lock()
+        if parse_workers is None:
+            parse_workers = default_parse_workers()
+        self._parse_pool = ParsePool(parse_workers, timeout=parse_timeout) if parse_workers > 0 else None
+        self.boilerplate = BoilerplateDetector(boilerplate_file) if strip_boilerplate else None
     
-    def _setup_driver(self):
-        """Set up the Chrome WebDriver."""
-        if self.driver is not None:
-            return
-            
+    def _create_driver(self) -> webdriver.Chrome:
+        """Create and configure a new Chrome WebDriver."""
+        driver = self._create_browser()
+        self._prepare_page(driver)
+        return driver
+    
+    def _create_browser(self) -> webdriver.Chrome:
+        """Start a new Chrome WebDriver."""
         options = Options()
         if self.headless:
             options.add_argument("--headless=new")
@@ -68,171 +203,427 @@ class SeleniumExtractor:
         options.add_argument("--window-size=1920,1080")
         
         # Set user agent to look like a real browser
-        options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                             "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36")
+        options.add_argument(f"user-agent={DEFAULT_USER_AGENT}")
+        
+        if self._tabs is not None:
+            # Tabs wait for their own page loads, WebDriver must not block on them
+            options.page_load_strategy = "none"
+            for argument in TAB_BROWSER_ARGUMENTS:
+                options.add_argument(argument)
         
         # Add additional preferences to avoid detection
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option("useAutomationExtension", False)
         
-        # Initialize the WebDriver with ChromeDriverManager
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
+        # Initialize the WebDriver, the driver binary is only looked up online once
+        service = Service(resolve_chromedriver(self.driver_path))
+        driver = webdriver.Chrome(service=service, options=options)
         
         # Set page load timeout
-        self.driver.set_page_load_timeout(self.timeout)
+        driver.set_page_load_timeout(self.timeout)
         
         # Execute script to bypass detection
-        self.driver.execute_script(
+        driver.execute_script(
             "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
         )
+        return driver
+    
+    def _prepare_page(self, driver: webdriver.Chrome):
+        """Configure a new browser, or a new tab, for loading pages."""
+        # Images, fonts, media and trackers are blocked per page through CDP
+        self._blocker.enable(driver)
+        
+        # Track network and DOM activity so fetch_page can tell when a page is ready
+        install_readiness_instrumentation(driver)
     
-    def _scroll_page(self):
-        """Scroll the page to load lazy content."""
+    def _scroll_page(self, driver: webdriver.Chrome) -> float:
+        """
+        Scroll the page in a few large jumps to load lazy content.
+        
+        Scrolling stops as soon as the page height stops growing once the bottom
+        is reached, or when scroll_budget is exhausted.
+        
+        Returns:
+            Time spent scrolling in seconds
+        """
+        start = time.monotonic()
+        deadline = start + self.scroll_budget
         try:
-            total_height = self.driver.execute_script("return document.body.scrollHeight")
-            for i in range(1, total_height, 200):
-                self.driver.execute_script(f"window.scrollTo(0, {i});")
-                time.sleep(0.1)
+            height = driver.execute_script(LAZY_SCROLL_JS, 0)
+            step = max(height // self.scroll_jumps, 1)
+            position = 0
+            while time.monotonic() < deadline:
+                position = min(position + step, height)
+                # Give IntersectionObserver callbacks a frame or two to fire
+                time.sleep(0.05)
+                new_height = driver.execute_script(LAZY_SCROLL_JS, position)
+                if position >= height:
+                    if new_height <= height:
+                        break
+                    # More content was appended, keep going with the same jump size
+                height = max(height, new_height)
             # Scroll back to top
-            self.driver.execute_script("window.scrollTo(0, 0);")
+            driver.execute_script("window.scrollTo(0, 0);")
         except Exception as e:
             print(f"Error scrolling page: {e}")
+        return time.monotonic() - start
     
-    def _close_driver(self):
-        """Close the WebDriver."""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except Exception as e:
-                print(f"Error closing driver: {e}")
-            finally:
-                self.driver = None
+    def close(self):
+        """
+        Close every WebDriver and parse worker owned by the extractor.
+        
+        Browsers are kept alive across process_urls calls and are also closed
+        automatically at interpreter exit, so calling this is only needed to
+        free them earlier.
+        """
+        with self._executor_lock:
+            for executor in (self._browser_executor, self._io_executor):
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            self._browser_executor = self._io_executor = None
+        if self._parse_pool is not None:
+            self._parse_pool.close()
+        if self.boilerplate is not None:
+            self.boilerplate.save()
+        self._pool.close()
+        if self._tabs is not None:
+            self._tabs.close()
+    
+    def reset_session(self):
+        """Forget the URLs processed so far so that they are fetched again."""
+        self._registry.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def fetch_page(self, url: str) -> Optional[str]:
+        """
+        Fetch the HTML content of a web page.
+        
+        Pages found in the page cache are served from disk, revalidating them with
+        a conditional request once their TTL has expired. Server-rendered pages are
+        fetched with a plain HTTP request when http_first is enabled; anything that
+        looks like it needs JavaScript goes to the browser.
+        
+        Args:
+            url: The URL to fetch
+            
+        Returns:
+            HTML content as string or None if request failed
+        """
+        start = time.monotonic()
+        rejected: Dict = {}
+        html = self._fetch_without_browser(url, rejected)
+        if html is None:
+            html = self._fetch_with_browser_hedged(url, rejected)
+            if html:
+                self._store_page(url, html)
+        self._record_fetch_time(url, start)
+        return html
+    
+    def _record_fetch_time(self, url: str, start: float):
+        """Add a fetch to the host's latency history (cache hits say nothing about the host)."""
+        if self.page_metrics.get(url, {}).get("fetch_method") != "cache":
+            self.latency.record(url, time.monotonic() - start)
+    
+    def _expected_cost(self, url: str) -> float:
+        """Estimate how long fetching a URL will take, in seconds."""
+        if self.page_cache is not None and self.page_cache.has_fresh(url):
+            return 0.0
+        expected = self.latency.expected(url)
+        if expected is None:
+            expected = self.latency.overall()
+        # Never seen anything: assume a browser load with the full readiness wait
+        return expected if expected is not None else float(self.wait_time + 2)
+    
+    def _fetch_without_browser(self, url: str, rejected: Optional[Dict] = None) -> Optional[str]:
+        """
+        Try to get a page from the page cache or over plain HTTP.
+        
+        Args:
+            url: The URL to fetch
+            rejected: Optional dict receiving, under "response", an HTML response that
+                was judged to need JavaScript (kept for hedging, see _hedge_request)
+            
+        Returns:
+            HTML content as string, or None if the page has to be loaded in the browser
+        """
+        entry = self.page_cache.get(url) if self.page_cache else None
+        if entry is not None and self.page_cache.is_fresh(entry):
+            self.page_cache.record("hits")
+            self.page_metrics[url] = {"fetch_method": "cache", "ready_wait": 0.0}
+            return entry["html"]
+        
+        validators = PageCache.validators(entry)
+        response = None
+        if self.http_first or validators:
+            response = self._http_request("GET", url, validators or None)
+            if entry is not None and response is not None and response.status_code == 304:
+                self.page_cache.record("revalidated")
+                self.page_cache.refresh(url, entry)
+                self.page_metrics[url] = {"fetch_method": "cache", "ready_wait": 0.0}
+                return entry["html"]
+        else:
+            # Only the headers are needed to keep PDFs and text files out of the browser
+            head = self._http_request("HEAD", url)
+            if (head is not None and head.status_code == 200
+                    and document_type(head.headers.get("Content-Type", ""))):
+                response = self._http_request("GET", url)
+        
+        if response is None or response.status_code != 200:
+            return None
+        
+        kind = document_type(response.headers.get("Content-Type", ""), response.content[:1024])
+        if kind == "pdf":
+            html = pdf_to_html(response.content, url, max_chars=self.max_content_length)
+        elif kind == "text":
+            declared = 'charset' in response.headers.get("Content-Type", "").lower()
+            html = text_to_html(response.content, url, response.encoding if declared else None)
+        else:
+            html = self._http.usable_html(response) if self.http_first else None
+            if html is None and rejected is not None:
+                rejected["response"] = response
+        
+        if html:
+            print(f"Fetched {kind or 'page'} over HTTP: {url}")
+            self.page_metrics[url] = {"fetch_method": kind or "http", "ready_wait": 0.0}
+            self._store_page(url, html, response.headers.get("ETag"),
+                             response.headers.get("Last-Modified"))
+            return html
+        
+        return None
+    
+    def _http_request(self, method: str, url: str,
+                      headers: Optional[Dict[str, str]] = None,
+                      hold_slot: bool = True) -> Optional[requests.Response]:
+        """Send an HTTP request through the host scheduler (see HostScheduler.slot()) and report its status."""
+        with self.scheduler.slot(url, hold=hold_slot):
+            response = self._http.request(method, url, headers)
+        if response is not None:
+            self.scheduler.report(url, response.status_code, response.headers.get("Retry-After"))
+        return response
+    
+    def _store_page(self, url: str, html: str,
+                    etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Record a cache miss and store the freshly fetched page."""
+        if self.page_cache:
+            self.page_cache.record("misses")
+            self.page_cache.put(url, html, etag=etag, last_modified=last_modified)
+    
+    def _hedge_delay(self, url: str) -> Optional[float]:
+        """
+        Time after which a browser load is slow for its host, or None to never hedge.
+        
+        Only browser loads count: the plain HTTP fetches of the host take a fraction
+        of the time and would make every browser load look slow.
+        """
+        if not self.hedge_requests:
+            return None
+        return self.browser_latency.percentile(url, 0.9, min_samples=HEDGE_MIN_SAMPLES)
+    
+    def _hedge_request(self, url: str, rejected: Optional[Dict] = None) -> Optional[str]:
+        """
+        Get a page over plain HTTP to race a slow browser load.
+        
+        Pages that looked like JavaScript shells only because of their markup weight
+        are accepted here: late content beats no content. The response rejected by
+        _fetch_without_browser is reused instead of requesting the page again.
+        """
+        try:
+            response = (rejected or {}).get("response")
+            if response is None:
+                # The browser load holds the host slot, waiting for it would defeat the hedge
+                response = self._http_request("GET", url, hold_slot=False)
+            return self._http.usable_html(response, min_text_ratio=0)
+        except Exception as e:
+            print(f"Error hedging {url}: {e}")
+            return None
+    
+    def _use_hedge(self, url: str):
+        """Record that a page was served by its hedging request."""
+        print(f"Used plain HTTP response for slow page: {url}")
+        self.page_metrics[url] = {"fetch_method": "hedged", "ready_wait": 0.0}
+    
+    def _fetch_with_browser_hedged(self, url: str, rejected: Optional[Dict] = None) -> Optional[str]:
+        """
+        Fetch a page with the browser, racing it against a plain HTTP request once it
+        takes longer than the 90th percentile of its host's browser loads (see hedge_requests).
+        
+        Args:
+            url: The URL to fetch
+            rejected: Dict filled by _fetch_without_browser
+            
+        Returns:
+            HTML content as string or None if both attempts failed
+        """
+        hedge_after = self._hedge_delay(url)
+        if hedge_after is None:
+            return self._fetch_with_browser(url)
+        
+        browser_executor, io_executor = self._executors()
+        lease: Dict = {}
+        browser_future = browser_executor.submit(self._fetch_with_browser, url, lease)
+        done, _ = wait([browser_future], timeout=hedge_after)
+        if done:
+            return browser_future.result()
+        
+        http_future = io_executor.submit(self._hedge_request, url, rejected)
+        pending = {browser_future, http_future}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if browser_future in done:
+                html = browser_future.result()
+                if html:
+                    return html
+                # The browser failed, the hedge may still succeed
+            if http_future in done:
+                html = http_future.result()
+                if html:
+                    # Keep the first result, free the browser still loading the page
+                    if not browser_future.done() and not browser_future.cancel():
+                        self._abort_browser_fetch(lease)
+                    self._use_hedge(url)
+                    return html
+        return None
+    
+    def _fetch_with_browser(self, url: str, lease: Optional[Dict] = None) -> Optional[str]:
         """
         Fetch the HTML content of a web page using Selenium.
         
         Args:
             url: The URL to fetch
+            lease: Optional dict shared with the caller; the driver in use is stored
+                under "driver" so that _abort_browser_fetch() can stop it
             
         Returns:
             HTML content as string or None if request failed
         """
+        lease = {} if lease is None else lease
+        with self.scheduler.slot(url):
+            start = time.monotonic()
+            html = self._load_in_browser(url, lease)
+            # Aborted loads were cut short, they say nothing about the host
+            if not lease.get("aborted"):
+                self.browser_latency.record(url, time.monotonic() - start)
+            return html
+    
+    def _load_in_browser(self, url: str, lease: Optional[Dict] = None) -> Optional[str]:
+        """Load a page in a pooled browser, see _fetch_with_browser."""
+        lease = {} if lease is None else lease
+        driver = None
+        healthy = True
+        recycle = False
         try:
-            self._setup_driver()
+            if lease.get("aborted"):
+                return None
+            acquired = self._pool.acquire()
+            # The lease says who owns the driver: this thread, or _abort_browser_fetch once it took it
+            with self._lease_lock:
+                if lease.get("aborted"):
+                    # Aborted while waiting for a host slot or a driver: it was never used
+                    self._pool.release(acquired)
+                    return None
+                lease["driver"] = driver = acquired
             
             print(f"Loading page: {url}")
-            self.driver.get(url)
+            self._blocker.apply(driver, url)
+            driver.get(url)
             
             # Wait for page to load
-            WebDriverWait(self.driver, self.timeout).until(
+            WebDriverWait(driver, self.timeout).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            # Additional wait for dynamic content
-            time.sleep(self.wait_time)
+            # Wait for dynamic content, but only as long as the page keeps changing
+            ready_wait = wait_until_ready(driver, self.wait_time, quiet_period=self.quiet_period)
+            self.page_metrics[url] = {"fetch_method": "browser", "ready_wait": ready_wait}
             
             # Scroll the page if enabled
             if self.scroll_page:
-                self._scroll_page()
+                self.page_metrics[url]["scroll_time"] = self._scroll_page(driver)
             
-            # Get the page source
-            html = self.driver.page_source
+            # Get the main content only, or the whole page source
+            html = extract_in_browser(driver) if self.in_browser_extraction else None
+            if html is None:
+                html = driver.page_source
+            
+            # Restart browsers that grew too large instead of letting them creep up
+            rss_mb, delta_mb, recycle = self._watchdog.after_page(driver)
+            self.page_metrics[url]["browser_rss_mb"] = rss_mb
+            self.page_metrics[url]["rss_delta_mb"] = delta_mb
+            if recycle:
+                print(f"Recycling browser using {rss_mb:.0f} MB")
             return html
             
         except TimeoutException:
             print(f"Timeout loading {url}")
             return None
         except WebDriverException as e:
+            # The browser itself may be gone, do not hand it to the next URL
+            healthy = False
             print(f"Error fetching {url}: {str(e)}")
             return None
         except Exception as e:
             print(f"Unexpected error fetching {url}: {str(e)}")
             return None
+        finally:
+            if driver is not None:
+                with self._lease_lock:
+                    taken = lease.get("taken", False)
+                if taken:
+                    # The browser has been (or is being) shut down by the caller
+                    pass
+                elif healthy and not recycle and not self._browser_retiring(driver):
+                    self._pool.release(driver)
+                else:
+                    if recycle:
+                        self._retire_browser(driver)
+                    self._pool.discard(driver)
+    
+    @staticmethod
+    def _browser_retiring(driver) -> bool:
+        """Tell whether a tab belongs to a browser that is being drained (always False without tabs)."""
+        browser = getattr(driver, "browser", None)
+        return browser is not None and browser.retiring
     
-    def extract_content(self, html: str) -> Tuple[str, str, List[str], Optional[BeautifulSoup]]:
+    def _retire_browser(self, driver):
+        """Make sure a driver's whole browser gets restarted, not just one of its tabs."""
+        self._watchdog.forget(driver)
+        browser = getattr(driver, "browser", None)
+        if browser is not None:
+            # Its other tabs are discarded as they finish, the browser quits with the last one
+            browser.retiring = True
+    
+    def _abort_browser_fetch(self, lease: Dict):
+        """
+        Stop a browser fetch started with the given lease and free its browser.
+        
+        A page load cannot be interrupted through WebDriver while driver.get() is
+        blocking, so the browser is quit and the pool starts a fresh one later.
+        """
+        with self._lease_lock:
+            lease["aborted"] = True
+            driver = lease.get("driver")
+            # Without a driver yet, the fetch thread gives back the one it gets
+            lease["taken"] = driver is not None
+        if driver is not None:
+            threading.Thread(target=self._pool.discard, args=(driver,), daemon=True).start()
+    
+    def extract_content(self, html: str, url: Optional[str] = None) -> Tuple[str, str, List[str], Optional[BeautifulSoup]]:
         """
         Extract the main content and subheadings from HTML.
         
         Args:
             html: HTML content as string
+            url: URL of the page, used to pick its domain extraction profile
             
         Returns:
             Tuple containing (title, main content text, list of subheadings, main content element)
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove unwanted elements
-        for element in soup.select('script, style, noscript, svg, footer, nav, aside, iframe, [role="banner"], [role="navigation"], .cookie-banner, .share-buttons, .sidebar, .ads, #header, #footer, [class*="cookie"], [class*="banner"], [class*="popup"], [id*="modal"], [class*="modal"]'):
-            if element:
-                element.decompose()
-        
-        # Extract title
-        title = ""
-        title_tag = soup.find('title')
-        if title_tag and title_tag.text:
-            title = title_tag.text.strip()
-        
-        # Extract headings for structure
-        headings = []
-        for heading in soup.find_all(['h1', 'h2', 'h3']):
-            if heading.text.strip():
-                headings.append((heading.name, heading.text.strip()))
-        
-        # More sophisticated content extraction
-        main_content_text = ""
-        main_content_element = None
-        content_candidates = [
-            # Try common content containers
-            soup.find('main'),
-            soup.find('article'),
-            soup.find(id='content'),
-            soup.find(attrs={"class": "content"}),
-            soup.find(attrs={"class": "main-content"}),
-            soup.find(attrs={"class": "article-content"}),
-            soup.find(attrs={"class": "post-content"}),
-            soup.find(attrs={"itemprop": "articleBody"}),
-            soup.find(attrs={"role": "main"})
-        ]
-        
-        # Filter out None values
-        content_candidates = [c for c in content_candidates if c]
-        
-        if content_candidates:
-            # Use the first found content container
-            main_content_element = content_candidates[0]
-            main_content_text = main_content_element.get_text(separator='\n\n', strip=True)
-        else:
-            # Fallback to content with most text
-            content_blocks = {}
-            for div in soup.find_all(['div', 'section']):
-                text = div.get_text(separator='\n\n', strip=True)
-                if len(text) > 200:  # Only consider blocks with substantial text
-                    content_blocks[div] = len(text)
-            
-            if content_blocks:
-                main_content_element = max(content_blocks, key=content_blocks.get)
-                main_content_text = main_content_element.get_text(separator='\n\n', strip=True)
-            else:
-                # Last resort: just get the body text
-                body = soup.find('body')
-                if body:
-                    main_content_element = body
-                    main_content_text = body.get_text(separator='\n\n', strip=True)
-        
-        # Limit content length if needed
-        if len(main_content_text) > self.max_content_length:
-            main_content_text = main_content_text[:self.max_content_length] + "..."
-        
-        # Extract paragraphs and format for better readability
-        paragraphs = re.split(r'\n\s*\n', main_content_text)
-        formatted_content = '\n\n'.join(p.strip() for p in paragraphs if p.strip())
-        
-        # Extract extracted headings as a separate list
-        subheadings = [heading_text for _, heading_text in headings]
-        
-        return title, formatted_content, subheadings, main_content_element
+        return extract_content(html, self.parser, self.max_content_length, url)
 
     def to_markdown(self, url: str, title: str, content: str, subheadings: List[str], html_element: Optional[BeautifulSoup] = None) -> str:
         """
@@ -248,58 +639,49 @@ class SeleniumExtractor:
         Returns:
             Markdown-formatted string
         """
-        markdown = f"# {title}\n\n"
-        markdown += f"*Source: {url}*\n\n"
-        
-        # Add subheadings if available
-        if subheadings:
-            markdown += "## Table of Contents\n\n"
-            for heading in subheadings[:10]:  # Limit to top 10 headings
-                markdown += f"- {heading}\n"
-            markdown += "\n"
-        
-        # Add main content with proper formatting
-        markdown += "## Full Content\n\n"
-        
-        # Use markdownify if we have the HTML element
-        if html_element:
-            # Convert the HTML directly to markdown
-            markdown_content = md(str(html_element), heading_style="ATX")
-            
-            # Clean up the markdown - remove excessive newlines and fix spacing
-            markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
-            
-            # Remove any empty headings
-            markdown_content = re.sub(r'#+\s*\n', '', markdown_content)
-            
-            # Add the properly converted content
-            markdown += markdown_content
-        else:
-            # Fallback to the extracted text content
-            markdown += content
-        
-        return markdown
+        return to_markdown(url, title, content, subheadings, html_element, self.max_content_length)
     
     def process_url(self, url: str) -> Optional[str]:
         """
         Process a single URL and return markdown-formatted content.
         
+        Each canonical URL is processed once per session (see reset_session);
+        later calls get the same result while it is among the registry's most recent
+        results, and concurrent calls wait for the one in flight.
+        
         Args:
             url: URL to process
             
         Returns:
             Markdown-formatted content or None if processing failed
         """
-        html = self.fetch_page(url)
-        if not html:
-            return None
+        future, owner = self._registry.claim(url)
+        if not owner:
+            return future.result()
         
+        markdown = None
         try:
-            title, content, subheadings, html_element = self.extract_content(html)
-            return self.to_markdown(url, title, content, subheadings, html_element)
+            html = self.fetch_page(url)
+            if html:
+                markdown = self._render(url, html)
         except Exception as e:
             print(f"Error processing content from {url}: {str(e)}")
-            return None
+        finally:
+            self._registry.resolve(url, future, markdown)
+        return markdown
+    
+    def _render(self, url: str, html: str) -> str:
+        """Extract the content of a fetched page and convert it to markdown, in a parse worker if enabled."""
+        if self._parse_pool is not None:
+            markdown = self._parse_pool.render(url, html, self.parser, self.max_content_length)
+        else:
+            markdown = render_page(url, html, self.parser, self.max_content_length)
+        
+        # Learning happens here rather than in the parse workers, so every page contributes
+        if self.boilerplate is not None:
+            markdown, removed = self.boilerplate.strip(url, markdown)
+            self.page_metrics.setdefault(url, {})["boilerplate_blocks"] = removed
+        return markdown
         
     def process_urls(self, urls: List[str]) -> List[str]:
         """
@@ -311,22 +693,333 @@ class SeleniumExtractor:
         Returns:
             List of markdown-formatted strings (None entries for failed URLs are filtered out)
         """
-        try:
-            results = []
+        markdowns: List[Optional[str]] = [None] * len(urls)
+        for index, _, markdown in self.iter_process_urls(urls):
+            markdowns[index] = markdown
+        
+        # Browsers are kept alive for the next batch, see close()
+        return [markdown for markdown in markdowns if markdown]
+    
+    def process_url_groups(self, groups: Dict[str, List[str]],
+                           deadline: Optional[float] = None) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        Process the URLs found for several questions, fetching each page only once.
+        
+        URLs are deduplicated across groups by canonical form and processed
+        concurrently, then every result is attributed back to each group that
+        asked for it.
+        
+        Args:
+            groups: Dictionary mapping each question to its list of URLs
+            deadline: Time budget in seconds for the whole call (None waits for every URL);
+                pages not done in time are cancelled, see process_urls_by_deadline
+            
+        Returns:
+            Dictionary mapping each question to an ordered {url: markdown} dictionary
+            (markdown is None for URLs that could not be processed)
+        """
+        unique_urls: Dict[str, str] = {}
+        for urls in groups.values():
             for url in urls:
+                unique_urls.setdefault(canonicalize_url(url), url)
+        
+        results: Dict[str, str] = {}
+        if deadline is not None:
+            for url, result in self.process_urls_by_deadline(list(unique_urls.values()), deadline).items():
+                results[canonicalize_url(url)] = result["markdown"]
+        else:
+            for _, url, markdown in self.iter_process_urls(list(unique_urls.values())):
+                results[canonicalize_url(url)] = markdown
+        
+        return {
+            group: {url: results.get(canonicalize_url(url)) for url in urls}
+            for group, urls in groups.items()
+        }
+    
+    def iter_process_urls(self, urls: List[str]) -> Iterator[Tuple[int, str, str]]:
+        """
+        Process multiple URLs and yield each document as soon as it is ready.
+        
+        Documents are yielded in completion order. At most pool_size pages are in
+        flight at a time, so memory stays bounded even if the consumer is slow.
+        
+        Args:
+            urls: List of URLs to process
+            
+        Yields:
+            Tuples of (index of the URL in urls, URL, markdown-formatted content);
+            failed URLs are skipped
+        """
+        workers = min(self.pool_size, len(urls))
+        if workers <= 1:
+            for index, url in enumerate(urls):
                 markdown = self.process_url(url)
                 if markdown:
-                    results.append(markdown)
+                    yield index, url, markdown
+            return
+        
+        # Fan the URLs out, alternating hosts so that workers do not queue behind one host.
+        # Browsers are started lazily by the pool, only for URLs that the cache and the
+        # plain HTTP fetch could not serve.
+        pending_indices = iter(self.scheduler.interleave(urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = {}
+            for index in islice(pending_indices, workers):
+                in_flight[executor.submit(self.process_url, urls[index])] = index
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    for next_index in islice(pending_indices, 1):
+                        in_flight[executor.submit(self.process_url, urls[next_index])] = next_index
+                    markdown = future.result()
+                    if markdown:
+                        yield index, urls[index], markdown
+    
+    def _executors(self) -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        """Return the (browser, io) executors used by the async API."""
+        with self._executor_lock:
+            if self._browser_executor is None:
+                # One thread per browser, so queued pages wait for a free browser
+                self._browser_executor = ThreadPoolExecutor(
+                    max_workers=self.pool_size, thread_name_prefix="browser")
+                self._io_executor = ThreadPoolExecutor(
+                    max_workers=max(8, self.pool_size * 2), thread_name_prefix="fetch")
+            return self._browser_executor, self._io_executor
+    
+    async def _afetch_with_browser(self, url: str) -> Optional[str]:
+        """Run a browser fetch on the browser executor, quitting the browser if cancelled."""
+        browser_executor, _ = self._executors()
+        lease: Dict = {}
+        future = browser_executor.submit(self._fetch_with_browser, url, lease)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancel():
+                self._abort_browser_fetch(lease)
+            raise
+    
+    async def _afetch_with_browser_hedged(self, url: str, rejected: Dict) -> Optional[str]:
+        """Asynchronous counterpart of _fetch_with_browser_hedged."""
+        hedge_after = self._hedge_delay(url)
+        if hedge_after is None:
+            return await self._afetch_with_browser(url)
+        
+        browser_task = asyncio.ensure_future(self._afetch_with_browser(url))
+        try:
+            done, _ = await asyncio.wait({browser_task}, timeout=hedge_after)
+            if done:
+                return browser_task.result()
             
-            return results
+            _, io_executor = self._executors()
+            http_task = asyncio.get_running_loop().run_in_executor(io_executor, self._hedge_request, url, rejected)
+            pending = {browser_task, http_task}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if browser_task in done:
+                    html = browser_task.result()
+                    if html:
+                        return html
+                    # The browser failed, the hedge may still succeed
+                if http_task in done:
+                    html = http_task.result()
+                    if html:
+                        self._use_hedge(url)
+                        return html
+            return None
         finally:
-            # Always close the driver when done
-            self._close_driver()
+            # Cancelling the browser fetch shuts down the browser still loading the page
+            browser_task.cancel()
+    
+    async def _aprocess_url(self, url: str) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        _, io_executor = self._executors()
+        
+        start = time.monotonic()
+        rejected: Dict = {}
+        html = await loop.run_in_executor(io_executor, self._fetch_without_browser, url, rejected)
+        if html is None:
+            try:
+                html = await self._afetch_with_browser_hedged(url, rejected)
+            finally:
+                self._record_fetch_time(url, start)
+            if not html:
+                return None
+            await loop.run_in_executor(io_executor, self._store_page, url, html)
+        else:
+            self._record_fetch_time(url, start)
+        
+        return await loop.run_in_executor(io_executor, self._render, url, html)
+    
+    async def aprocess_url(self, url: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Asynchronous counterpart of process_url.
+        
+        Cache lookups and HTTP requests run on an I/O thread pool and browser work
+        on a dedicated executor with one thread per browser, so the event loop is
+        never blocked. If the coroutine is cancelled or times out while a page is
+        loading, the browser loading it is shut down instead of being left busy.
+        
+        Args:
+            url: URL to process
+            timeout: Maximum time in seconds for the whole URL (None for no limit)
+            
+        Returns:
+            Markdown-formatted content or None if processing failed or timed out
+        """
+        future, owner = self._registry.claim(url)
+        if not owner:
+            try:
+                # shield() so that giving up here does not cancel the shared result
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+            except asyncio.TimeoutError:
+                print(f"Timeout processing {url}")
+                return None
+        
+        markdown = None
+        try:
+            markdown = await asyncio.wait_for(self._aprocess_url(url), timeout)
+        except asyncio.TimeoutError:
+            print(f"Timeout processing {url}")
+        except Exception as e:
+            print(f"Error processing content from {url}: {str(e)}")
+        finally:
+            self._registry.resolve(url, future, markdown)
+        return markdown
+    
+    async def aprocess_urls(self, urls: List[str], timeout: Optional[float] = None) -> List[str]:
+        """
+        Asynchronous counterpart of process_urls.
+        
+        Args:
+            urls: List of URLs to process
+            timeout: Maximum time in seconds for each URL (None for no limit)
+            
+        Returns:
+            List of markdown-formatted strings in input order (failed URLs are filtered out)
+        """
+        markdowns: List[Optional[str]] = [None] * len(urls)
+        async for index, _, markdown in self.aiter_process_urls(urls, timeout):
+            markdowns[index] = markdown
+        return [markdown for markdown in markdowns if markdown]
+    
+    async def aiter_process_urls(self, urls: List[str],
+                                 timeout: Optional[float] = None) -> AsyncIterator[Tuple[int, str, str]]:
+        """
+        Asynchronous counterpart of iter_process_urls.
+        
+        Args:
+            urls: List of URLs to process
+            timeout: Maximum time in seconds for each URL (None for no limit)
+            
+        Yields:
+            Tuples of (index of the URL in urls, URL, markdown-formatted content)
+            in completion order; failed URLs are skipped
+        """
+        async def run(index: int) -> Tuple[int, Optional[str]]:
+            return index, await self.aprocess_url(urls[index], timeout)
+        
+        # Pages served over HTTP do not need a browser, so allow more of them in flight
+        window = max(8, self.pool_size * 2)
+        pending_indices = iter(self.scheduler.interleave(urls))
+        in_flight = {asyncio.ensure_future(run(index)) for index in islice(pending_indices, window)}
+        try:
+            while in_flight:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for next_index in islice(pending_indices, 1):
+                        in_flight.add(asyncio.ensure_future(run(next_index)))
+                    index, markdown = task.result()
+                    if markdown:
+                        yield index, urls[index], markdown
+        finally:
+            # Stopping the iteration early cancels (and frees) the remaining pages
+            for task in in_flight:
+                task.cancel()
+    
+    async def aprocess_urls_by_deadline(self, urls: List[str], budget: float) -> Dict[str, Dict]:
+        """
+        Process URLs within a time budget for the whole batch.
+        
+        URLs are started cheapest first, by expected cost (fresh cache entries, then
+        hosts that were fast so far), so that as many as possible complete. When the
+        budget runs out, pages still loading are cancelled, shutting down their
+        browser, and URLs not started yet are skipped.
+        
+        Args:
+            urls: List of URLs to process
+            budget: Time in seconds after which the batch returns
+            
+        Returns:
+            Dictionary mapping each URL, in input order, to {"status", "markdown", "elapsed"};
+            status is "done", "failed", "cancelled" (budget ran out while processing) or
+            "skipped" (budget ran out before it was started)
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + budget
+        results: Dict[str, Dict] = {url: {"status": "skipped", "markdown": None, "elapsed": None}
+                                    for url in urls}
+        costs = {url: self._expected_cost(url) for url in results}
+        pending = sorted(results, key=lambda url: costs[url])
+        
+        window = max(8, self.pool_size * 2)
+        in_flight: Dict[asyncio.Task, str] = {}
+        
+        def launch():
+            while pending and len(in_flight) < window:
+                url = pending.pop(0)
+                in_flight[asyncio.ensure_future(self.aprocess_url(url))] = url
+        
+        launch()
+        try:
+            while in_flight:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(in_flight, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url = in_flight.pop(task)
+                    markdown = task.result()
+                    results[url] = {"status": "done" if markdown else "failed", "markdown": markdown,
+                                    "elapsed": loop.time() - start}
+                launch()
+        finally:
+            for task, url in in_flight.items():
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    markdown = task.result()
+                    results[url] = {"status": "done" if markdown else "failed", "markdown": markdown,
+                                    "elapsed": loop.time() - start}
+                    continue
+                task.cancel()
+                results[url] = {"status": "cancelled", "markdown": None, "elapsed": loop.time() - start}
+            if in_flight:
+                # Let the cancelled pages hand their browsers back before returning
+                await asyncio.wait(in_flight)
+        return results
+    
+    def process_urls_by_deadline(self, urls: List[str], budget: float) -> Dict[str, Dict]:
+        """
+        Process URLs within a time budget for the whole batch, see aprocess_urls_by_deadline.
+        
+        Must not be called from a running event loop; await aprocess_urls_by_deadline there.
+        
+        Args:
+            urls: List of URLs to process
+            budget: Time in seconds after which the batch returns
+            
+        Returns:
+            Dictionary mapping each URL to {"status", "markdown", "elapsed"}
+        """
+        return asyncio.run(self.aprocess_urls_by_deadline(urls, budget))
 
 
 def main():
+    # Only needed by the example, importing it loads the embedding stack
+    from vector_db import process_markdown_content
+    
     # Example usage
-    extractor = SeleniumExtractor(headless=True, wait_time=5, scroll_page=True)
+    extractor = SeleniumExtractor(headless=True, wait_time=5, scroll_page=True, pool_size=3)
     
     # Example URLs
     urls = [
@@ -336,7 +1029,8 @@ def main():
         "https://en.wikipedia.org/wiki/Web_scraping"
     ]
 
-    markdown_contents = extractor.process_urls(urls)
+    with extractor:
+        markdown_contents = extractor.process_urls(urls)
     query = "Qu'est-ce qu'un système de caisse"
     process_markdown_content(markdown_contents, query)
     if not markdown_contents:
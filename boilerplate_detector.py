@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+BoilerplateDetector module for removing blocks repeated across pages of the same site.
+Menus, disclaimers and "related articles" lists that survive the per-page cleaning show
+up identically on many pages of a domain. Each markdown block is hashed after normalising
+case and whitespace; blocks seen on enough distinct pages of a domain are dropped.
+What was learned can be kept in a JSON file between runs.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from politeness import host_of
+from url_registry import canonicalize_url
+
+
+DEFAULT_BOILERPLATE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "deepsearch", "boilerplate.json")
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def block_hash(block: str) -> str:
+    """Return the hash of a markdown block, ignoring case and whitespace."""
+    return _digest(_SPACE_RE.sub(' ', block.lower()).strip())
+
+
+class BoilerplateDetector:
+    """
+    A class to learn which blocks repeat across the pages of each domain and strip them.
+    """
+
+    def __init__(self,
+                 store_path: Optional[str] = None,
+                 min_pages: int = 3,
+                 min_block_length: int = 20,
+                 max_pages_per_domain: int = 1000,
+                 max_blocks_per_domain: int = 20000,
+                 save_every: int = 20):
+        """
+        Initialize the BoilerplateDetector.
+
+        Args:
+            store_path: JSON file where learned blocks are kept between runs (None keeps them in memory)
+            min_pages: Number of distinct pages of a domain a block must appear on to be stripped
+            min_block_length: Blocks shorter than this are never considered boilerplate
+            max_pages_per_domain: Number of page identities remembered per domain
+            max_blocks_per_domain: Number of block hashes kept per domain; blocks seen on a
+                single page are forgotten first
+            save_every: Number of newly learned pages after which the store is written
+        """
+        self.store_path = store_path
+        self.min_pages = max(2, min_pages)
+        self.min_block_length = min_block_length
+        self.max_pages_per_domain = max_pages_per_domain
+        self.max_blocks_per_domain = max_blocks_per_domain
+        self.save_every = save_every
+        # domain -> {"pages": [page digests], "blocks": {block hash: number of pages}}
+        self._domains: Dict[str, Dict] = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        if store_path:
+            self._load()
+            # Pages learned since the last periodic save would be lost otherwise
+            atexit.register(self.save)
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        """Return the domain a page's blocks are grouped under."""
+        host = host_of(url)
+        return host[4:] if host.startswith("www.") else host
+
+    def _candidate_blocks(self, markdown: str) -> List[Tuple[str, Optional[str]]]:
+        """Split markdown into blocks, with the hash of those that may be boilerplate."""
+        blocks = []
+        for block in markdown.split('\n\n'):
+            stripped = block.strip()
+            # Headings are structure, not boilerplate
+            if len(stripped) < self.min_block_length or stripped.startswith('#'):
+                blocks.append((block, None))
+            else:
+                blocks.append((block, block_hash(stripped)))
+        return blocks
+
+    def _learn(self, domain: str, page: str, hashes: List[str]):
+        """Count the blocks of a page once (caller holds the lock)."""
+        state = self._domains.setdefault(domain, {"pages": [], "blocks": {}})
+        if page in state["pages"]:
+            return
+        state["pages"].append(page)
+        if len(state["pages"]) > self.max_pages_per_domain:
+            del state["pages"][0]
+
+        counts = state["blocks"]
+        for block in set(hashes):
+            counts[block] = counts.get(block, 0) + 1
+        if len(counts) > self.max_blocks_per_domain:
+            state["blocks"] = {block: count for block, count in counts.items() if count > 1}
+
+        self._unsaved += 1
+
+    def strip(self, url: str, markdown: str) -> Tuple[str, int]:
+        """
+        Learn the blocks of a page and remove those repeated across its domain.
+
+        Args:
+            url: The page URL
+            markdown: The page's markdown, blocks separated by blank lines
+
+        Returns:
+            Tuple containing (markdown without boilerplate blocks, number of blocks removed)
+        """
+        domain = self.domain_of(url)
+        blocks = self._candidate_blocks(markdown)
+        hashes = [block for _, block in blocks if block is not None]
+
+        with self._lock:
+            self._learn(domain, _digest(canonicalize_url(url)), hashes)
+            counts = self._domains[domain]["blocks"]
+            kept = [block for block, digest in blocks
+                    if digest is None or counts.get(digest, 0) < self.min_pages]
+            should_save = self.store_path and self._unsaved >= self.save_every
+
+        if should_save:
+            self.save()
+        removed = len(blocks) - len(kept)
+        return ('\n\n'.join(kept) if removed else markdown), removed
+
+    def _load(self):
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                self._domains = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Error reading boilerplate store {self.store_path}: {e}")
+
+    def save(self):
+        """Write the learned blocks to the store file, if any were learned since the last save."""
+        if not self.store_path:
+            return
+        with self._lock:
+            if not self._unsaved:
+                return
+            data = json.dumps(self._domains)
+            self._unsaved = 0
+        tmp_path = f"{self.store_path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.store_path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.store_path)
+        except OSError as e:
+            print(f"Error writing boilerplate store {self.store_path}: {e}")
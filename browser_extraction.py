@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Main-content extraction inside the browser.
+Instead of transferring the whole page_source (inline scripts, SVG, menus...) over the
+WebDriver connection, a script run in the page removes boilerplate, picks the main-content
+element with the same rules as content_scoring and returns it with the title and headings as
+one JSON payload. The payload is turned into a small HTML page for the regular
+extract_content/to_markdown path.
+"""
+
+import html
+import json
+from typing import Dict, Optional
+from selenium import webdriver
+
+
+# Mirrors content_scoring: boilerplate rules, CONTENT_CONTAINER_RULES, then the <div>/<section>
+# with the best text length x (1 - link density), then the body. Works on a copy of the body.
+READABILITY_JS = """
+var BOILERPLATE = 'script, style, noscript, template, svg, footer, nav, aside, iframe, '
+    + '[role="banner"], [role="navigation"], #header, #footer, [id*="modal"], '
+    + '[class*="cookie"], [class*="banner"], [class*="popup"], [class*="modal"], '
+    + '.share-buttons, .sidebar, .ads';
+var CONTAINERS = ['main', 'article', '#content', '.content', '.main-content', '.article-content',
+                  '.post-content', '[itemprop="articleBody"]', '[role="main"]'];
+var MIN_BLOCK_LENGTH = 200;
+
+var body = document.body ? document.body.cloneNode(true) : document.createElement('body');
+body.querySelectorAll(BOILERPLATE).forEach(function (e) { e.remove(); });
+
+var content = null;
+for (var i = 0; i < CONTAINERS.length && !content; i++) {
+    content = body.querySelector(CONTAINERS[i]);
+}
+if (!content) {
+    var bestScore = 0;
+    body.querySelectorAll('div, section').forEach(function (block) {
+        var length = block.textContent.trim().length;
+        if (length <= MIN_BLOCK_LENGTH) return;
+        var links = 0;
+        block.querySelectorAll('a').forEach(function (a) { links += a.textContent.trim().length; });
+        var score = length * (1 - links / length);
+        if (score > bestScore) { bestScore = score; content = block; }
+    });
+}
+content = content || body;
+
+var headings = [];
+body.querySelectorAll('h1, h2, h3').forEach(function (h) {
+    var text = h.textContent.trim();
+    if (text && !content.contains(h)) headings.push([h.tagName.toLowerCase(), text]);
+});
+
+return JSON.stringify({title: document.title, headings: headings, html: content.outerHTML});
+"""
+
+
+def payload_to_html(payload: Dict) -> str:
+    """
+    Build an HTML page out of the result of READABILITY_JS.
+
+    Args:
+        payload: Dictionary with the title, the headings found outside the main content
+            as (tag, text) pairs, and the main-content HTML
+
+    Returns:
+        HTML page with the headings followed by the main content in <main>
+    """
+    parts = [f"<html><head><title>{html.escape(payload.get('title') or '')}</title></head><body>"]
+    headings = payload.get("headings") or []
+    if headings:
+        parts.append("<div>")
+        parts.extend(f"<{tag}>{html.escape(text)}</{tag}>" for tag, text in headings)
+        parts.append("</div>")
+    parts.append(f"<main>{payload.get('html') or ''}</main></body></html>")
+    return "\n".join(parts)
+
+
+def extract_in_browser(driver: webdriver.Chrome) -> Optional[str]:
+    """
+    Extract the main content of the page loaded in a driver.
+
+    Args:
+        driver: WebDriver with the page loaded
+
+    Returns:
+        HTML page holding the title, headings and main content, or None if the script failed
+    """
+    try:
+        return payload_to_html(json.loads(driver.execute_script(READABILITY_JS)))
+    except Exception as e:
+        print(f"Error extracting content in the browser: {e}")
+        return None
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Single-pass page analysis for main-content extraction.
+One iterative walk over the parsed tree removes boilerplate with precompiled rules, records
+the title, headings and well-known content containers, and computes text length, link density
+and tag counts for every node bottom-up, so the main block can be picked without calling
+get_text() on every candidate.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup, Tag
+from bs4.element import CData, NavigableString
+
+
+BOILERPLATE_TAGS = frozenset(['script', 'style', 'noscript', 'svg', 'footer', 'nav', 'aside', 'iframe'])
+BOILERPLATE_ROLES = frozenset(['banner', 'navigation'])
+BOILERPLATE_IDS = frozenset(['header', 'footer'])
+# cookie/banner/popup/modal match anywhere in the class attribute, the others only as whole class names
+BOILERPLATE_CLASS_RE = re.compile(r'cookie|banner|popup|modal|(?:^|\s)(?:share-buttons|sidebar|ads)(?:\s|$)')
+BOILERPLATE_ID_RE = re.compile(r'modal')
+
+# Common content containers, in order of preference
+CONTENT_CONTAINER_RULES: List[Tuple[str, Optional[str], Optional[str]]] = [
+    # (tag name or None, attribute, value)
+    ('main', None, None),
+    ('article', None, None),
+    (None, 'id', 'content'),
+    (None, 'class', 'content'),
+    (None, 'class', 'main-content'),
+    (None, 'class', 'article-content'),
+    (None, 'class', 'post-content'),
+    (None, 'itemprop', 'articleBody'),
+    (None, 'role', 'main'),
+]
+
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3'])
+BLOCK_TAGS = frozenset(['div', 'section'])
+_TEXT_TYPES = (NavigableString, CData)
+
+
+def is_boilerplate(tag: Tag) -> bool:
+    """Tell whether an element is page furniture (scripts, navigation, banners, pop-ups...)."""
+    if tag.name in BOILERPLATE_TAGS:
+        return True
+    attrs = tag.attrs
+    if not attrs:
+        return False
+    if attrs.get('role') in BOILERPLATE_ROLES:
+        return True
+    element_id = attrs.get('id')
+    if element_id and (element_id in BOILERPLATE_IDS or BOILERPLATE_ID_RE.search(element_id)):
+        return True
+    classes = attrs.get('class')
+    if classes:
+        class_string = classes if isinstance(classes, str) else ' '.join(classes)
+        if BOILERPLATE_CLASS_RE.search(class_string):
+            return True
+    return False
+
+
+def _matches(tag: Tag, rule: Tuple[str, Optional[str], Optional[str]]) -> bool:
+    name, attribute, value = rule
+    if name is not None:
+        return tag.name == name
+    actual = tag.attrs.get(attribute)
+    if actual is None:
+        return False
+    if isinstance(actual, list):
+        return value in actual
+    return actual == value
+
+
+class PageAnalysis:
+    """
+    Result of analyze_page.
+    """
+
+    def __init__(self):
+        self.title_tag: Optional[Tag] = None
+        self.body: Optional[Tag] = None
+        self.heading_tags: List[Tag] = []
+        # First element matching each CONTENT_CONTAINER_RULES entry
+        self.containers: List[Optional[Tag]] = [None] * len(CONTENT_CONTAINER_RULES)
+        # Best <div>/<section> by text score and its score
+        self.best_block: Optional[Tag] = None
+        self.best_score = 0.0
+        # Per-node (text length, text node count, link text length, descendant tag count), keyed by id()
+        self.stats: Dict[int, Tuple[int, int, int, int]] = {}
+
+    @property
+    def container(self) -> Optional[Tag]:
+        """The preferred well-known content container, if the page has one."""
+        return next((c for c in self.containers if c is not None), None)
+
+
+def analyze_page(soup: BeautifulSoup, min_block_length: int = 200, probe: bool = True) -> PageAnalysis:
+    """
+    Clean and analyse a parsed page in a single walk.
+
+    Boilerplate elements are removed from the tree. Block scores are
+    text length x (1 - link density); only blocks with more than
+    min_block_length characters of text are considered.
+
+    Args:
+        soup: The parsed page, or the element to analyse (modified in place)
+        min_block_length: Minimum text length of a candidate block
+        probe: Whether to look for content containers and score blocks; without it
+            the walk only removes boilerplate and collects the title and headings
+
+    Returns:
+        A PageAnalysis describing the cleaned page
+    """
+    analysis = PageAnalysis()
+    stats = analysis.stats
+    removed: List[Tag] = []
+    order_of: Dict[int, int] = {}
+    best_key = (0.0, 0)
+    order = 0
+
+    stack: List[Tuple[Tag, bool]] = [(soup, False)]
+    while stack:
+        node, exiting = stack.pop()
+
+        if exiting:
+            chars = strings = links = tags = 0
+            for child in node.contents:
+                if isinstance(child, Tag):
+                    child_stats = stats.get(id(child))
+                    if child_stats is not None:
+                        chars += child_stats[0]
+                        strings += child_stats[1]
+                        links += child_stats[2]
+                        tags += child_stats[3] + 1
+                elif type(child) in _TEXT_TYPES:
+                    length = len(child.strip())
+                    if length:
+                        chars += length
+                        strings += 1
+            if node.name == 'a':
+                links = chars
+            stats[id(node)] = (chars, strings, links, tags)
+
+            if node.name in BLOCK_TAGS:
+                # Same length as get_text(separator='\n\n', strip=True)
+                text_length = chars + 2 * max(strings - 1, 0)
+                if text_length > min_block_length:
+                    score = text_length * (1 - links / max(chars, 1))
+                    # Ties go to the block that comes first in the document
+                    key = (score, -order_of[id(node)])
+                    if key > best_key:
+                        best_key = key
+                        analysis.best_block = node
+                        analysis.best_score = score
+            continue
+
+        if node is not soup:
+            if is_boilerplate(node):
+                removed.append(node)
+                continue
+
+            name = node.name
+            if name == 'title' and analysis.title_tag is None:
+                analysis.title_tag = node
+            elif name == 'body' and analysis.body is None:
+                analysis.body = node
+            elif name in HEADING_TAGS:
+                analysis.heading_tags.append(node)
+            if probe:
+                for index, rule in enumerate(CONTENT_CONTAINER_RULES):
+                    if analysis.containers[index] is None and _matches(node, rule):
+                        analysis.containers[index] = node
+
+        if probe:
+            order += 1
+            if node.name in BLOCK_TAGS:
+                order_of[id(node)] = order
+            stack.append((node, True))
+        for child in reversed(node.contents):
+            if isinstance(child, Tag):
+                stack.append((child, False))
+
+    for element in removed:
+        element.decompose()
+
+    return analysis
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Extraction of non-HTML documents (PDF, plain text) downloaded over HTTP.
+Loading these in Chrome only yields the viewer shell, so they are converted directly into a
+minimal HTML page that goes through the regular extract_content/to_markdown path.
+"""
+
+import html
+import io
+import os
+from typing import List, Optional
+from urllib.parse import unquote, urlsplit
+
+
+DOCUMENT_TYPES = {
+    "application/pdf": "pdf",
+    "application/x-pdf": "pdf",
+    "text/plain": "text",
+}
+
+
+def document_type(content_type: str, head: bytes = b"") -> Optional[str]:
+    """
+    Tell which kind of non-HTML document a response holds.
+
+    Args:
+        content_type: Content-Type header of the response
+        head: First bytes of the body, used when the header is missing or generic
+
+    Returns:
+        "pdf", "text", or None for HTML and anything else
+    """
+    kind = DOCUMENT_TYPES.get(content_type.split(";")[0].strip().lower())
+    if kind is None and head.lstrip().startswith(b"%PDF-"):
+        kind = "pdf"
+    return kind
+
+
+def _fallback_title(url: str) -> str:
+    name = os.path.basename(unquote(urlsplit(url).path)) or url
+    return os.path.splitext(name)[0].replace("_", " ").replace("-", " ")
+
+
+def document_to_html(title: str, paragraphs: List[str], headings: Optional[List[str]] = None) -> str:
+    """Build a minimal HTML page out of a document's title, headings and paragraphs."""
+    parts = [f"<html><head><title>{html.escape(title)}</title></head><body>"]
+    # Headings are listed outside <main> since their position in the text is unknown
+    if headings:
+        parts.append("<div>")
+        parts.extend(f"<h2>{html.escape(heading)}</h2>" for heading in headings)
+        parts.append("</div>")
+    parts.append("<main>")
+    for paragraph in paragraphs:
+        parts.append(f"<p>{html.escape(paragraph)}</p>")
+    parts.append("</main></body></html>")
+    return "\n".join(parts)
+
+
+def _paragraphs(text: str, break_on_sentence_end: bool = False) -> List[str]:
+    """
+    Re-join lines that were wrapped inside a paragraph.
+
+    Args:
+        text: Text with one line per visual line
+        break_on_sentence_end: Also end a paragraph on lines ending with . ! ? or :
+            (PDF text extraction rarely keeps blank lines between paragraphs)
+
+    Returns:
+        List of paragraphs
+    """
+    paragraphs = []
+    current = ""
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            if current.endswith("-") and line[:1].islower():
+                current = current[:-1] + line
+            else:
+                current = f"{current} {line}" if current else line
+        if current and (not line or (break_on_sentence_end and line[-1] in ".!?:")):
+            paragraphs.append(current)
+            current = ""
+    if current:
+        paragraphs.append(current)
+    return paragraphs
+
+
+def text_to_html(data: bytes, url: str, encoding: Optional[str] = None) -> str:
+    """
+    Convert a plain text document to a minimal HTML page.
+
+    Args:
+        data: Raw document bytes
+        url: URL of the document (used for the title)
+        encoding: Encoding of the document, defaults to UTF-8
+
+    Returns:
+        HTML content as string
+    """
+    text = data.decode(encoding or "utf-8", errors="replace")
+    paragraphs = _paragraphs(text)
+    title = paragraphs[0][:120] if paragraphs else _fallback_title(url)
+    return document_to_html(title, paragraphs)
+
+
+def pdf_to_html(data: bytes, url: str, max_chars: Optional[int] = None) -> Optional[str]:
+    """
+    Convert a PDF document to a minimal HTML page.
+
+    Args:
+        data: Raw PDF bytes
+        url: URL of the document (used for the title if the PDF has none)
+        max_chars: Stop reading pages once this much text has been extracted
+
+    Returns:
+        HTML content as string, or None if the PDF could not be read
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        print("pypdf is not installed, PDF documents cannot be extracted")
+        return None
+
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        title = ""
+        if reader.metadata and reader.metadata.title:
+            title = str(reader.metadata.title).strip()
+
+        # Top-level bookmarks play the role of the page's headings
+        headings = []
+        for item in reader.outline or []:
+            if not isinstance(item, list) and getattr(item, "title", None):
+                headings.append(str(item.title).strip())
+
+        texts = []
+        length = 0
+        for page in reader.pages:
+            text = page.extract_text() or ""
+            texts.append(text)
+            length += len(text)
+            if max_chars and length >= max_chars:
+                break
+    except Exception as e:
+        print(f"Error reading PDF {url}: {e}")
+        return None
+
+    paragraphs = _paragraphs("\n\n".join(texts), break_on_sentence_end=True)
+    return document_to_html(title or _fallback_title(url), paragraphs, headings)
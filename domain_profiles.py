@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Extraction profiles for sites with a known, stable layout.
+A profile names the main-content element of a domain and the page furniture to drop
+inside it, as CSS selectors compiled once with soupsieve. Pages from a profiled domain
+skip the generic content-container probing and block scoring.
+Profiles registered at runtime are replayed in the parse worker processes from their raw
+selectors (see registered_profiles() and load_profiles()).
+"""
+
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+
+
+class DomainProfile:
+    """
+    A class describing where the content of a domain's pages is.
+    """
+
+    def __init__(self, domain: str, content_selectors: Sequence[str], drop_selectors: Sequence[str] = ()):
+        """
+        Initialize the DomainProfile.
+
+        Args:
+            domain: Domain the profile applies to, subdomains included
+            content_selectors: CSS selectors of the main-content element, in order of preference
+            drop_selectors: CSS selectors of elements to remove from the main content
+        """
+        self.domain = domain.lower()
+        # Raw selectors, compiled patterns cannot be sent to other processes
+        self.content_selector_specs = list(content_selectors)
+        self.drop_selector_specs = list(drop_selectors)
+        self.content_selectors = [soupsieve.compile(selector) for selector in content_selectors]
+        self.drop_selector = soupsieve.compile(', '.join(drop_selectors)) if drop_selectors else None
+
+    def spec(self) -> Tuple[str, List[str], List[str]]:
+        """Return the arguments of register_profile() that recreate this profile."""
+        return self.domain, self.content_selector_specs, self.drop_selector_specs
+
+    def find_content(self, soup: BeautifulSoup) -> Optional[Tag]:
+        """
+        Find the main-content element of a page and remove the profile's boilerplate from it.
+
+        Args:
+            soup: The parsed page (modified in place)
+
+        Returns:
+            The main-content element, or None if the page does not match the profile
+        """
+        for selector in self.content_selectors:
+            element = selector.select_one(soup)
+            if element is not None:
+                if self.drop_selector is not None:
+                    for boilerplate in self.drop_selector.select(element):
+                        boilerplate.decompose()
+                return element
+        return None
+
+
+# Profiles by domain, see register_profile()
+DOMAIN_PROFILES: Dict[str, DomainProfile] = {}
+# Profile of each host seen so far (None for hosts without one)
+_profiles_by_host: Dict[str, Optional[DomainProfile]] = {}
+# Incremented by every registration, so that worker processes can tell they are out of date
+_version = 0
+_lock = threading.Lock()
+
+
+def register_profile(domain: str, content_selectors: Sequence[str], drop_selectors: Sequence[str] = ()) -> DomainProfile:
+    """
+    Add or replace the extraction profile of a domain.
+
+    Args:
+        domain: Domain the profile applies to, subdomains included
+        content_selectors: CSS selectors of the main-content element, in order of preference
+        drop_selectors: CSS selectors of elements to remove from the main content
+
+    Returns:
+        The registered profile
+    """
+    global _version
+    profile = DomainProfile(domain, content_selectors, drop_selectors)
+    with _lock:
+        DOMAIN_PROFILES[profile.domain] = profile
+        _profiles_by_host.clear()
+        _version += 1
+    return profile
+
+
+def registered_profiles() -> Tuple[int, List[Tuple[str, List[str], List[str]]]]:
+    """
+    Return the registered profiles as picklable specs.
+
+    Returns:
+        Tuple containing (registration counter, list of (domain, content selectors,
+        drop selectors) specs)
+    """
+    with _lock:
+        return _version, [profile.spec() for profile in DOMAIN_PROFILES.values()]
+
+
+def load_profiles(specs: Sequence[Tuple[str, Sequence[str], Sequence[str]]]):
+    """
+    Register profiles from specs, e.g. those of registered_profiles() in another process.
+
+    Args:
+        specs: List of (domain, content selectors, drop selectors) specs
+    """
+    for domain, content_selectors, drop_selectors in specs:
+        register_profile(domain, content_selectors, drop_selectors)
+
+
+def profile_for(url: str) -> Optional[DomainProfile]:
+    """
+    Return the extraction profile of a URL's domain.
+
+    Args:
+        url: The page URL
+
+    Returns:
+        The profile of the most specific matching domain, or None
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    with _lock:
+        if host in _profiles_by_host:
+            return _profiles_by_host[host]
+        labels: List[str] = host.split('.')
+        profile = None
+        for start in range(len(labels)):
+            profile = DOMAIN_PROFILES.get('.'.join(labels[start:]))
+            if profile is not None:
+                break
+        _profiles_by_host[host] = profile
+        return profile
+
+
+register_profile(
+    'economie.gouv.fr',
+    ['main#main-content', 'main', '[role="main"]'],
+    ['.fr-breadcrumb', '.fr-skiplinks', '.fr-share', '.share-buttons', '.fr-sidemenu', '.fr-follow'],
+)
+register_profile(
+    'service-public.fr',
+    ['main#main', 'main', '.sp-article', 'article'],
+    ['.fr-breadcrumb', '.fr-skiplinks', '.fr-share', '.sp-feedback', '.related-links', '#modal-feedback'],
+)
+register_profile(
+    'wikipedia.org',
+    ['#mw-content-text .mw-parser-output', '#mw-content-text', '#bodyContent'],
+    ['#toc', '.toc', '.mw-editsection', 'sup.reference', '.reflist', '.navbox', '.hatnote',
+     '.ambox', '.mw-jump-link', '#catlinks', '.noprint'],
+)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+DriverPool module for sharing a fixed number of warm WebDriver instances between worker threads.
+Each driver is only ever used by one worker at a time, and a driver that fails is discarded
+and replaced instead of poisoning the rest of the batch. Drivers stay alive across batches,
+are health-checked before reuse, recycled after a number of pages and shut down at exit.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from selenium import webdriver
+
+
+class DriverPool:
+    """
+    A thread-safe pool of WebDriver instances created lazily by a factory.
+    """
+
+    def __init__(self, factory: Callable[[], webdriver.Chrome], size: int = 1,
+                 max_pages_per_driver: int = 50):
+        """
+        Initialize the DriverPool.
+
+        Args:
+            factory: Callable returning a new, fully configured WebDriver
+            size: Maximum number of drivers alive at the same time
+            max_pages_per_driver: Number of pages after which a driver is recycled (0 disables recycling)
+        """
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages_per_driver = max_pages_per_driver
+        # LIFO so the most recently used (warmest) driver is handed out first
+        self._idle = queue.LifoQueue()
+        self._drivers: List[webdriver.Chrome] = []
+        self._pages: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        # Browsers outlive batches, make sure none is left behind at exit
+        atexit.register(self.close)
+
+    def _reserve_slot(self) -> bool:
+        """Reserve room for a new driver if the pool is not full yet."""
+        with self._lock:
+            if len(self._drivers) < self.size:
+                self._drivers.append(None)
+                return True
+            return False
+
+    def _create(self) -> webdriver.Chrome:
+        """Create a driver for a previously reserved slot."""
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._drivers.remove(None)
+            raise
+        with self._lock:
+            self._drivers[self._drivers.index(None)] = driver
+        return driver
+
+    @staticmethod
+    def is_healthy(driver: webdriver.Chrome) -> bool:
+        """Check that the browser behind a driver still answers commands."""
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _take_idle(self, timeout: float = 0) -> Optional[webdriver.Chrome]:
+        """Take an idle driver that passes the health check, discarding dead ones."""
+        while True:
+            try:
+                driver = self._idle.get(timeout=timeout) if timeout > 0 else self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            if self.is_healthy(driver):
+                return driver
+            print("Discarding unresponsive driver")
+            self.discard(driver)
+
+    def acquire(self, timeout: Optional[float] = None) -> webdriver.Chrome:
+        """
+        Take a driver out of the pool, creating one if there is still room.
+
+        Args:
+            timeout: Maximum time to wait for a driver to become free (None waits forever)
+
+        Returns:
+            A WebDriver reserved for the caller until release() or discard()
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            driver = self._take_idle()
+            if driver is not None:
+                return driver
+
+            if self._reserve_slot():
+                return self._create()
+
+            # Wake up regularly: a recycled or discarded driver frees a slot
+            # without putting anything back in the idle queue
+            wait = 0.5 if deadline is None else min(0.5, deadline - time.monotonic())
+            if wait <= 0:
+                raise queue.Empty
+            driver = self._take_idle(wait)
+            if driver is not None:
+                return driver
+
+    def release(self, driver: webdriver.Chrome):
+        """Return a healthy driver to the pool, recycling it once it has served enough pages."""
+        with self._lock:
+            pages = self._pages.get(id(driver), 0) + 1
+            self._pages[id(driver)] = pages
+        if self.max_pages_per_driver and pages >= self.max_pages_per_driver:
+            print(f"Recycling driver after {pages} pages")
+            self.discard(driver)
+            return
+        self._idle.put(driver)
+
+    def discard(self, driver: webdriver.Chrome):
+        """Quit a broken or worn-out driver and free its slot so a fresh one can be created."""
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error closing driver: {e}")
+
+    def warm_up(self, count: int):
+        """
+        Start up to ``count`` drivers in parallel so browser cold starts overlap.
+
+        Args:
+            count: Number of drivers that should be ready (capped at the pool size)
+        """
+        missing = 0
+        while missing < count and self._reserve_slot():
+            missing += 1
+        if not missing:
+            return
+
+        def start():
+            try:
+                self._idle.put(self._create())
+            except Exception as e:
+                print(f"Error starting driver: {e}")
+
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            for _ in range(missing):
+                executor.submit(start)
+
+    def close(self):
+        """Quit every driver owned by the pool."""
+        with self._lock:
+            drivers = [d for d in self._drivers if d is not None]
+            self._drivers = [d for d in self._drivers if d is None]
+            self._pages.clear()
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Error closing driver: {e}")
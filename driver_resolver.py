@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+ChromeDriver binary resolution with an on-disk cache.
+ChromeDriverManager checks online for the latest driver every time it is asked, which is slow
+and fails on machines without internet access. The resolved path is cached on disk together
+with the Chrome version it was resolved for, so later runs start without any network lookup.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from typing import Optional
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+CHROMEDRIVER_ENV = "CHROMEDRIVER_PATH"
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "deepsearch", "chromedriver.json")
+
+_CHROME_BINARIES = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+_VERSION_RE = re.compile(r'(\d+)\.\d+\.\d+(\.\d+)?')
+
+# Path resolved by this process, shared by every driver it creates
+_resolved_path: Optional[str] = None
+_resolve_lock = threading.Lock()
+
+
+def _major_version(command: str) -> Optional[str]:
+    """Run ``command --version`` and return the major version it reports."""
+    try:
+        output = subprocess.run([command, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION_RE.search(output)
+    return match.group(1) if match else None
+
+
+def chrome_major_version() -> Optional[str]:
+    """Return the major version of the installed Chrome/Chromium, if it can be found."""
+    for binary in _CHROME_BINARIES:
+        path = binary if os.path.isabs(binary) else shutil.which(binary)
+        if path and os.path.exists(path):
+            version = _major_version(path)
+            if version:
+                return version
+    return None
+
+
+def _is_executable(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _read_cache(cache_file: str) -> dict:
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache_file: str, entry: dict):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=2)
+    except OSError as e:
+        print(f"Error writing ChromeDriver cache: {e}")
+
+
+def resolve_chromedriver(explicit_path: Optional[str] = None,
+                         cache_file: str = DEFAULT_CACHE_FILE) -> str:
+    """
+    Find a ChromeDriver binary compatible with the installed Chrome.
+
+    Resolution order: the explicit path, the CHROMEDRIVER_PATH environment
+    variable, the path already resolved by this process, the on-disk cache
+    (if it was resolved for the same Chrome major version), ChromeDriverManager,
+    and finally any chromedriver found on the PATH.
+
+    Args:
+        explicit_path: Path to a ChromeDriver binary that should be used as is
+        cache_file: JSON file remembering the last resolved driver
+
+    Returns:
+        Path to the ChromeDriver binary
+    """
+    global _resolved_path
+
+    for path in (explicit_path, os.environ.get(CHROMEDRIVER_ENV)):
+        if path:
+            if not _is_executable(path):
+                raise FileNotFoundError(f"ChromeDriver not found or not executable: {path}")
+            return path
+
+    with _resolve_lock:
+        if _is_executable(_resolved_path):
+            return _resolved_path
+
+        chrome_version = chrome_major_version()
+        cached = _read_cache(cache_file)
+        if (_is_executable(cached.get("path"))
+                and (chrome_version is None or cached.get("chrome_version") == chrome_version)):
+            _resolved_path = cached["path"]
+            return _resolved_path
+
+        try:
+            path = ChromeDriverManager().install()
+        except Exception as e:
+            path = shutil.which("chromedriver")
+            if not path:
+                raise
+            print(f"ChromeDriverManager failed ({e}), using {path}")
+
+        _write_cache(cache_file, {
+            "path": path,
+            "chrome_version": chrome_version,
+            "driver_version": _major_version(path),
+            "resolved_at": time.time(),
+        })
+        _resolved_path = path
+        return path
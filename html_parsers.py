@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+HTML parser backends for content extraction.
+BeautifulSoup can sit on top of several parsers; the pure-Python html.parser is the slowest,
+so the fastest installed backend is used unless one is requested explicitly.
+"""
+
+from typing import List, Optional
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+
+# Supported backends, fastest first
+PARSER_BACKENDS = ('lxml', 'html5lib', 'html.parser')
+# Backends considered when none is requested (html5lib is slower than html.parser)
+PREFERRED_PARSERS = ('lxml', 'html.parser')
+
+
+def available_parsers() -> List[str]:
+    """Return the supported parser backends that are installed."""
+    return [name for name in PARSER_BACKENDS if builder_registry.lookup(name) is not None]
+
+
+def resolve_parser(name: Optional[str] = None) -> str:
+    """
+    Pick the parser backend to use.
+
+    Args:
+        name: Requested backend ("lxml", "html5lib" or "html.parser"), or None for the fastest installed one
+
+    Returns:
+        Name of the backend to pass to BeautifulSoup
+    """
+    installed = available_parsers()
+    if name is None:
+        return next(parser for parser in PREFERRED_PARSERS if parser in installed)
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}', expected one of {', '.join(PARSER_BACKENDS)}")
+    if name not in installed:
+        raise ValueError(f"Parser backend '{name}' is not installed")
+    return name
+
+
+def parse_html(html: str, parser: str = 'html.parser') -> BeautifulSoup:
+    """
+    Parse an HTML document with the given backend.
+
+    Args:
+        html: HTML content as string
+        parser: Name of the backend, see resolve_parser()
+
+    Returns:
+        The parsed document
+    """
+    return BeautifulSoup(html, parser)
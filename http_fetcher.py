@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+HttpFetcher module for retrieving server-rendered pages with plain, pooled HTTP requests.
+Pages that look like they need JavaScript to show their content are rejected so the caller
+can fall back to a real browser.
+"""
+
+import re
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                      "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36")
+
+_INVISIBLE_RE = re.compile(r'<(script|style|svg|template|noscript)\b.*?</\1\s*>|<!--.*?-->',
+                           re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+_NOSCRIPT_RE = re.compile(r'<noscript\b[^>]*>(.*?)</noscript\s*>', re.IGNORECASE | re.DOTALL)
+_JS_WALL_RE = re.compile(r'(enable|activate|activer|activez)\s+(the\s+)?javascript|javascript\s+(is\s+)?required',
+                         re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+def visible_text(html: str) -> str:
+    """Return the text a reader would see in an HTML fragment, whitespace-collapsed."""
+    text = _TAG_RE.sub(' ', _INVISIBLE_RE.sub(' ', html))
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def needs_javascript(html: str,
+                     min_text_length: int = 200,
+                     min_text_ratio: float = 0.005) -> bool:
+    """
+    Guess whether a page only shows its content once JavaScript has run.
+
+    Args:
+        html: Raw HTML as returned by the server
+        min_text_length: Below this many visible characters the page is considered empty
+        min_text_ratio: Below this visible-text to markup ratio the page is considered a shell
+
+    Returns:
+        True if the page should be rendered in a browser
+    """
+    text = visible_text(html)
+    if len(text) < min_text_length or len(text) / max(len(html), 1) < min_text_ratio:
+        return True
+
+    # A <main>/<article> that exists but is empty is filled in client-side
+    for tag in ('main', 'article'):
+        match = re.search(rf'<{tag}\b[^>]*>(.*?)</{tag}\s*>', html, re.IGNORECASE | re.DOTALL)
+        if match and len(visible_text(match.group(1))) < min_text_length // 4:
+            return True
+
+    # "Please enable JavaScript" walls
+    for noscript in _NOSCRIPT_RE.findall(html):
+        if _JS_WALL_RE.search(noscript) and len(text) < min_text_length * 10:
+            return True
+
+    return False
+
+
+class HttpFetcher:
+    """
+    A class to fetch web pages over a pooled requests session.
+    """
+
+    def __init__(self,
+                 timeout: float = 10,
+                 pool_maxsize: int = 10,
+                 user_agent: str = DEFAULT_USER_AGENT):
+        """
+        Initialize the HttpFetcher.
+
+        Args:
+            timeout: Timeout for each request in seconds
+            pool_maxsize: Number of keep-alive connections kept per host
+            user_agent: User agent sent with every request
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8",
+        })
+
+    def request(self, method: str, url: str,
+                headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+        """
+        Perform an HTTP request.
+
+        Args:
+            method: HTTP method ("GET" or "HEAD")
+            url: The URL to fetch
+            headers: Extra request headers
+
+        Returns:
+            The response, or None if the request failed
+        """
+        try:
+            return self.session.request(method, url, headers=headers, timeout=self.timeout,
+                                        allow_redirects=True)
+        except requests.RequestException as e:
+            print(f"HTTP error fetching {url}: {str(e)}")
+            return None
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+        """Perform a GET request, see request()."""
+        return self.request("GET", url, headers)
+
+    def head(self, url: str) -> Optional[requests.Response]:
+        """Perform a HEAD request, see request()."""
+        return self.request("HEAD", url)
+
+    @staticmethod
+    def decode(response: requests.Response) -> str:
+        """Decode a response body, preferring the charset declared by the page."""
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            match = _META_CHARSET_RE.search(response.content[:4096])
+            response.encoding = match.group(1).decode('ascii') if match else 'utf-8'
+        return response.text
+
+    def usable_html(self, response: Optional[requests.Response],
+                    min_text_ratio: float = 0.005) -> Optional[str]:
+        """
+        Return the HTML of a response if it can be used without a browser.
+
+        Args:
+            response: Response returned by get()
+            min_text_ratio: Visible-text to markup ratio below which the page is considered
+                a shell, see needs_javascript()
+
+        Returns:
+            HTML content as string, or None if the page needs a browser
+        """
+        if response is None or response.status_code != 200:
+            return None
+        if 'html' not in response.headers.get('Content-Type', '').lower():
+            return None
+
+        html = self.decode(response)
+        if needs_javascript(html, min_text_ratio=min_text_ratio):
+            return None
+        return html
+
+    def fetch_html(self, url: str) -> Optional[str]:
+        """
+        Fetch a page and return its HTML if it can be used without a browser.
+
+        Args:
+            url: The URL to fetch
+
+        Returns:
+            HTML content as string, or None if the page needs a browser
+        """
+        return self.usable_html(self.get(url))
+
+    def close(self):
+        """Close the underlying session and its connections."""
+        self.session.close()
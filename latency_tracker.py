@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+LatencyTracker module for remembering how long page fetches take on each host.
+The most recent fetch times of every host give the expected cost of a URL (used to schedule
+batches under a deadline) and its tail latency.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+from politeness import host_of
+
+
+class LatencyTracker:
+    """
+    A class to keep a sliding window of fetch times per host.
+    """
+
+    def __init__(self, window: int = 50):
+        """
+        Initialize the LatencyTracker.
+
+        Args:
+            window: Number of recent fetch times kept per host
+        """
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, url: str, seconds: float):
+        """Record the time taken to fetch a URL."""
+        host = host_of(url)
+        with self._lock:
+            samples = self._samples.get(host)
+            if samples is None:
+                samples = self._samples[host] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, url: str, fraction: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Return a percentile of the recent fetch times of a URL's host.
+
+        Args:
+            url: Any URL of the host
+            fraction: Percentile as a fraction, e.g. 0.9 for the 90th percentile
+            min_samples: Number of samples below which no estimate is given
+
+        Returns:
+            Fetch time in seconds, or None if the host has too few samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(host_of(url), ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def expected(self, url: str) -> Optional[float]:
+        """Return the median recent fetch time of a URL's host, or None if it was never fetched."""
+        return self.percentile(url, 0.5)
+
+    def overall(self) -> Optional[float]:
+        """Return the median of the recent fetch times of all hosts, or None without samples."""
+        with self._lock:
+            samples = sorted(sample for host_samples in self._samples.values() for sample in host_samples)
+        return samples[len(samples) // 2] if samples else None
@@ -1,20 +1,25 @@
-from test_ollama import test_ollama_chain, init_ollama, get_json_response
-from fisc_gpt import FiscGPT
-from extract_prompts import extract_reformulated_prompts
-# from text_to_markdown import summarize_and_convert_to_md, save_markdown_to_file
-from test_searcher import process_ai_generated_questions
-from SeleniumExtractor import SeleniumExtractor
-from GoogleSearcher import GoogleSearcher as DuckSearcher
-from vector_db import process_markdown_content
-from text_to_markdown import text_to_md
 import json
 import ast
 
 
+def main():
+    # Imported here rather than at the top: the parse workers are spawned processes that
+    # re-import this module, and must not load the LLM and embedding stacks
+    from test_ollama import test_ollama_chain, init_ollama, get_json_response
+    from fisc_gpt import FiscGPT
+    from extract_prompts import extract_reformulated_prompts
+    # from text_to_markdown import summarize_and_convert_to_md, save_markdown_to_file
+    from test_searcher import process_ai_generated_questions
+    from SeleniumExtractor import SeleniumExtractor
+    from page_cache import DEFAULT_CACHE_DIR
+    from boilerplate_detector import DEFAULT_BOILERPLATE_FILE
+    from GoogleSearcher import GoogleSearcher as DuckSearcher
+    from vector_db import process_markdown_content
+    from text_to_markdown import text_to_md
 
-if __name__ == "__main__":
     print("Testing Ollama with LangChain...")
-    extractor = SeleniumExtractor(headless=True, wait_time=5, scroll_page=True)
+    extractor = SeleniumExtractor(headless=True, wait_time=5, scroll_page=True, pool_size=4,
+                                  cache_dir=DEFAULT_CACHE_DIR, boilerplate_file=DEFAULT_BOILERPLATE_FILE)
     init_ollama()
     google_searcher = DuckSearcher()
     ask = FiscGPT()
@@ -33,7 +38,10 @@ if __name__ == "__main__":
         print("requettes", requettes)
         urls = google_searcher.batch_search(requettes)
         print("urls", urls)
-        markdown_contents = extractor.process_urls(urls)
+        # Pages returned by several requests are only fetched once
+        extracted = extractor.process_url_groups(urls)
+        markdown_contents = list({content: None for contents in extracted.values()
+                                  for content in contents.values() if content})
         ret = process_markdown_content(markdown_contents, markdown_contents)
         text_to_md(ret)
         # prompts = extract_reformulated_prompts(test_ollama_chain(ask, "divider_subject"))
@@ -51,4 +59,8 @@ if __name__ == "__main__":
     # # Test with coder prompt if needed
     # # test_ollama_chain(ask, "coder")
     
-    print("Test completed!") 
\ No newline at end of file
+    print("Test completed!") 
+
+
+if __name__ == "__main__":
+    main()
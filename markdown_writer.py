@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Direct conversion of a parsed BeautifulSoup element to markdown.
+The tree is walked once and markdown blocks (headings, paragraphs, lists, tables, code,
+quotes) are emitted straight into a buffer, instead of serialising the element back to HTML
+and having a second library parse it again. Blank lines are collapsed and empty headings
+dropped as the blocks are emitted. With a character budget the walk stops as soon as enough
+text has been emitted, so the cost of giant pages is bounded.
+"""
+
+import re
+from typing import List, Optional
+from bs4 import Tag
+from bs4.element import CData, NavigableString
+
+
+HEADING_LEVELS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+BLOCK_TAGS = frozenset([
+    'address', 'article', 'aside', 'blockquote', 'body', 'dd', 'details', 'dl', 'div', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'html', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'summary',
+    'table', 'ul',
+])
+CELL_TAGS = frozenset(['tr', 'th', 'td'])
+SKIPPED_TAGS = frozenset(['script', 'style', 'noscript', 'template', 'head', 'title', 'svg', 'button', 'select'])
+_TEXT_TYPES = (NavigableString, CData)
+_SPACE_RE = re.compile(r'[ \t\r\n\f\v]+')
+_RUN_RE = re.compile(r' {2,}')
+
+
+class MarkdownWriter:
+    """
+    A class to convert a BeautifulSoup element to markdown in a single walk.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        """
+        Initialize the MarkdownWriter.
+
+        Args:
+            max_chars: Number of text characters after which conversion stops (None for no limit)
+        """
+        self.max_chars = max_chars
+        self.truncated = False
+        self._used = 0
+
+    def _take(self, text: str) -> str:
+        """Account for a text node, cutting it at the budget."""
+        if self.max_chars is None:
+            return text
+        remaining = self.max_chars - self._used
+        if len(text) > remaining:
+            text = text[:remaining]
+            self.truncated = True
+        self._used += len(text)
+        return text
+
+    def convert(self, element: Tag) -> str:
+        """
+        Convert an element and its descendants to markdown.
+
+        Args:
+            element: The element to convert
+
+        Returns:
+            Markdown-formatted string
+        """
+        blocks: List[str] = []
+        self._blocks(element, blocks)
+        if self.truncated:
+            blocks.append('...')
+        return '\n\n'.join(blocks) + '\n' if blocks else ''
+
+    # Block level
+
+    def _blocks(self, node: Tag, out: List[str]):
+        """Emit the markdown blocks of a node's children into out."""
+        inline: List[str] = []
+        for child in node.children:
+            if self.truncated:
+                break
+            if isinstance(child, Tag):
+                name = child.name
+                if name in SKIPPED_TAGS:
+                    continue
+                if name in BLOCK_TAGS:
+                    self._flush(inline, out)
+                    self._block(child, out)
+                    continue
+                inline.append(self._inline_tag(child))
+            elif type(child) in _TEXT_TYPES:
+                inline.append(self._take(_SPACE_RE.sub(' ', child)))
+        self._flush(inline, out)
+
+    @staticmethod
+    def _flush(inline: List[str], out: List[str]):
+        """Turn pending inline content into a paragraph block."""
+        if not inline:
+            return
+        # Runs of spaces come from adjacent text nodes and from blocks met inline
+        text = '\n'.join(_RUN_RE.sub(' ', line).strip() for line in ''.join(inline).split('\n'))
+        inline.clear()
+        text = text.strip()
+        if text:
+            out.append(text)
+
+    def _block(self, node: Tag, out: List[str]):
+        name = node.name
+        if name in HEADING_LEVELS:
+            text = ' '.join(self._inline_children(node).split())
+            # Empty headings are dropped
+            if text:
+                out.append(f"{'#' * HEADING_LEVELS[name]} {text}")
+        elif name in ('ul', 'ol'):
+            text = self._list(node)
+            if text:
+                out.append(text)
+        elif name == 'li':
+            # List item outside of a list
+            text = self._list_item(node, '- ')
+            if text:
+                out.append(text)
+        elif name == 'table':
+            text = self._table(node)
+            if text:
+                out.append(text)
+        elif name == 'pre':
+            code = self._take(node.get_text().strip('\n'))
+            if code.strip():
+                out.append(f"```\n{code}\n```")
+        elif name == 'blockquote':
+            inner: List[str] = []
+            self._blocks(node, inner)
+            if inner:
+                out.append('\n'.join('> ' + line if line else '>' for line in '\n\n'.join(inner).split('\n')))
+        elif name == 'hr':
+            out.append('---')
+        else:
+            self._blocks(node, out)
+
+    def _list(self, node: Tag) -> str:
+        items = []
+        number = 1
+        if node.name == 'ol' and node.get('start', '').isdigit():
+            number = int(node['start'])
+        for child in node.children:
+            if not isinstance(child, Tag):
+                continue
+            if child.name == 'li':
+                marker = f"{number}. " if node.name == 'ol' else '- '
+                number += 1
+                text = self._list_item(child, marker)
+            elif child.name in ('ul', 'ol'):
+                # Nested list placed directly inside the list
+                text = _indent(self._list(child), '  ')
+            else:
+                continue
+            if text:
+                items.append(text)
+        return '\n'.join(items)
+
+    def _list_item(self, node: Tag, marker: str) -> str:
+        blocks: List[str] = []
+        self._blocks(node, blocks)
+        if not blocks:
+            return ''
+        text = '\n'.join(blocks)
+        lines = text.split('\n')
+        padding = ' ' * len(marker)
+        return '\n'.join([marker + lines[0]] + [padding + line if line else line for line in lines[1:]])
+
+    def _table(self, node: Tag) -> str:
+        rows: List[List[str]] = []
+        for row in node.find_all('tr'):
+            if self.truncated:
+                break
+            # Skip rows of nested tables, they are rendered inside their cell
+            if row.find_parent('table') is not node:
+                continue
+            cells = [
+                ' '.join(self._inline_children(cell).split()).replace('|', '\\|')
+                for cell in row.find_all(['th', 'td'], recursive=False)
+            ]
+            if any(cells):
+                rows.append(cells)
+        if not rows:
+            return ''
+
+        width = max(len(row) for row in rows)
+        rows = [row + [''] * (width - len(row)) for row in rows]
+        lines = ['| ' + ' | '.join(rows[0]) + ' |', '| ' + ' | '.join(['---'] * width) + ' |']
+        lines.extend('| ' + ' | '.join(row) + ' |' for row in rows[1:])
+        return '\n'.join(lines)
+
+    # Inline level
+
+    def _inline_children(self, node: Tag) -> str:
+        parts = []
+        for child in node.children:
+            if self.truncated:
+                break
+            if isinstance(child, Tag):
+                if child.name in SKIPPED_TAGS:
+                    continue
+                text = self._inline_tag(child)
+                # Blocks and cells inside inline content (e.g. a table in a cell) stay separate words
+                if child.name in BLOCK_TAGS or child.name in CELL_TAGS:
+                    text = f" {text} "
+                parts.append(text)
+            elif type(child) in _TEXT_TYPES:
+                parts.append(self._take(_SPACE_RE.sub(' ', child)))
+        return ''.join(parts)
+
+    def _inline_tag(self, node: Tag) -> str:
+        name = node.name
+        if name == 'br':
+            return '\n'
+        if name == 'img':
+            src = node.get('src')
+            return f"![{node.get('alt', '')}]({src})" if src else ''
+        if name == 'code':
+            code = self._take(node.get_text())
+            return f"`{code}`" if code.strip() else code
+
+        text = self._inline_children(node)
+        if not text.strip():
+            return text
+        if name in ('strong', 'b'):
+            return _wrap(text, '**')
+        if name in ('em', 'i'):
+            return _wrap(text, '*')
+        if name == 'a':
+            href = node.get('href')
+            if href and not href.startswith(('javascript:', '#')):
+                return _wrap(text, '[', f"]({href})")
+        return text
+
+
+def _wrap(text: str, before: str, after: Optional[str] = None) -> str:
+    """Wrap text in markup, keeping surrounding whitespace outside of it."""
+    stripped = _RUN_RE.sub(' ', text.strip())
+    leading = text[:len(text) - len(text.lstrip())]
+    trailing = text[len(text.rstrip()):]
+    return f"{leading}{before}{stripped}{before if after is None else after}{trailing}"
+
+
+def _indent(text: str, padding: str) -> str:
+    return '\n'.join(padding + line if line else line for line in text.split('\n'))
+
+
+def element_to_markdown(element: Tag, max_chars: Optional[int] = None) -> str:
+    """
+    Convert a BeautifulSoup element to markdown.
+
+    Args:
+        element: The element to convert
+        max_chars: Number of text characters after which conversion stops, ending
+            the markdown with "..." (None for no limit)
+
+    Returns:
+        Markdown-formatted string
+    """
+    try:
+        return MarkdownWriter(max_chars).convert(element)
+    except RecursionError:
+        # Pathologically deep trees: keep the text, lose the structure
+        return bounded_text(element, max_chars)
+
+
+def bounded_text(element: Tag, max_chars: Optional[int] = None) -> str:
+    """
+    Same as element.get_text(separator='\\n\\n', strip=True), cut to max_chars characters
+    (followed by "...") without visiting the text past the limit.
+
+    Args:
+        element: The element to read
+        max_chars: Maximum length of the text (None for no limit)
+
+    Returns:
+        The text of the element
+    """
+    parts: List[str] = []
+    length = 0
+    for string in element.stripped_strings:
+        length += len(string) + (2 if parts else 0)
+        parts.append(string)
+        if max_chars is not None and length > max_chars:
+            return '\n\n'.join(parts)[:max_chars] + "..."
+    return '\n\n'.join(parts)
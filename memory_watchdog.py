@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+MemoryWatchdog module for keeping the memory of long-lived browsers in check.
+Headless Chrome grows from page to page. After each page the resident memory of the whole
+browser process tree (chromedriver, Chrome and its renderers) is sampled, the growth since
+the previous page of the same browser is reported, and browsers above a ceiling are flagged
+for recycling. psutil is used when installed, /proc otherwise (Linux).
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _proc_children() -> Dict[int, List[int]]:
+    """Map every process id to its children, from /proc."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses, fields resume after the last ')'
+        ppid = int(stat[stat.rindex(b")") + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _proc_rss(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Return the resident memory of a process and all its descendants.
+
+    Args:
+        pid: Id of the root process
+
+    Returns:
+        Resident set size in bytes, or None if it cannot be measured on this system
+    """
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            total = root.memory_info().rss
+            for child in root.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir("/proc"):
+        return None
+    children = _proc_children()
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += _proc_rss(current)
+        stack.extend(children.get(current, []))
+    return total
+
+
+def browser_pid(driver) -> Optional[int]:
+    """Return the id of the chromedriver process behind a WebDriver (or a BrowserTab)."""
+    browser = getattr(driver, "browser", None)
+    if browser is not None:
+        driver = browser.driver
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+class MemoryWatchdog:
+    """
+    A class to sample browser memory after each page and tell when a browser must be recycled.
+    """
+
+    def __init__(self, max_rss_mb: Optional[float] = 1536):
+        """
+        Initialize the MemoryWatchdog.
+
+        Args:
+            max_rss_mb: Memory of a browser process tree, in MB, above which it is recycled
+                (None only records measurements)
+        """
+        self.max_rss_mb = max_rss_mb
+        # Memory of each browser after its previous page, by chromedriver pid
+        self._last_rss: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def after_page(self, driver) -> Tuple[Optional[float], Optional[float], bool]:
+        """
+        Sample the memory of a driver's browser after it loaded a page.
+
+        Args:
+            driver: The WebDriver (or BrowserTab) that loaded the page
+
+        Returns:
+            Tuple containing (browser memory in MB, growth since its previous page in MB,
+            whether the browser is over the ceiling); measurements are None when unavailable
+        """
+        pid = browser_pid(driver)
+        rss = process_tree_rss(pid) if pid is not None else None
+        if rss is None:
+            return None, None, False
+
+        with self._lock:
+            previous = self._last_rss.get(pid)
+            self._last_rss[pid] = rss
+        rss_mb = rss / (1024 * 1024)
+        delta_mb = None if previous is None else (rss - previous) / (1024 * 1024)
+        over = self.max_rss_mb is not None and rss_mb > self.max_rss_mb
+        return rss_mb, delta_mb, over
+
+    def forget(self, driver):
+        """Drop the measurements of a browser that is being shut down."""
+        pid = browser_pid(driver)
+        with self._lock:
+            self._last_rss.pop(pid, None)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+PageCache module for keeping fetched pages on disk between runs.
+Entries store the HTML with its ETag/Last-Modified validators and fetch time. Fresh entries
+are served directly, stale ones can be revalidated with a conditional request.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from url_registry import canonicalize_url
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "deepsearch", "pages")
+
+
+class PageCache:
+    """
+    A class to store rendered pages on disk, keyed by canonical URL.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = 24 * 3600):
+        """
+        Initialize the PageCache.
+
+        Args:
+            cache_dir: Directory where cache entries are written
+            ttl: Time in seconds during which an entry is served without revalidation
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.stats: Dict[str, int] = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Return the cache key of a URL."""
+        return canonicalize_url(url)
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(self.key(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def record(self, outcome: str):
+        """Count a cache outcome ("hits", "revalidated" or "misses")."""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Read the cache entry of a URL, fresh or not.
+
+        Args:
+            url: The page URL
+
+        Returns:
+            The entry (url, html, etag, last_modified, fetched_at) or None
+        """
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def has_fresh(self, url: str) -> bool:
+        """Tell whether a URL has a fresh entry, without reading it (the file time is the fetch time)."""
+        try:
+            return time.time() - os.path.getmtime(self._path(url)) < self.ttl
+        except OSError:
+            return False
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Tell whether an entry is still within its TTL."""
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    @staticmethod
+    def validators(entry: Optional[Dict]) -> Dict[str, str]:
+        """Return the conditional request headers for revalidating an entry."""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, html: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Store a page.
+
+        Args:
+            url: The page URL
+            html: The page HTML
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+        """
+        self._write(url, {
+            "url": self.key(url),
+            "html": html,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        })
+
+    def refresh(self, url: str, entry: Dict):
+        """Mark an entry as fresh again after a successful revalidation."""
+        entry["fetched_at"] = time.time()
+        self._write(url, entry)
+
+    def _write(self, url: str, entry: Dict):
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing page cache for {url}: {e}")
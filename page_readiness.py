@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Page readiness detection for Selenium-driven pages.
+Instead of sleeping a fixed amount of time after a page load, the page is polled until the
+document is complete, no fetch/XHR request is in flight and the DOM has stopped changing.
+"""
+
+import time
+from selenium import webdriver
+
+
+# Installed in every new document (through CDP) before any page script runs,
+# so requests and DOM mutations made during the initial load are tracked too.
+READINESS_INSTRUMENTATION_JS = """
+(function () {
+  if (window.__deepsearchReadiness) { return; }
+  var state = window.__deepsearchReadiness = {pending: 0, lastActivity: performance.now()};
+  function touch() { state.lastActivity = performance.now(); }
+  function done() { state.pending = Math.max(0, state.pending - 1); touch(); }
+
+  if (window.fetch) {
+    var originalFetch = window.fetch;
+    window.fetch = function () {
+      state.pending++; touch();
+      return originalFetch.apply(this, arguments).then(
+        function (r) { done(); return r; },
+        function (e) { done(); throw e; });
+    };
+  }
+  var originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    state.pending++; touch();
+    this.addEventListener('loadend', done);
+    return originalSend.apply(this, arguments);
+  };
+
+  new MutationObserver(touch).observe(document, {
+    subtree: true, childList: true, attributes: true, characterData: true
+  });
+  if (window.PerformanceObserver) {
+    try {
+      new PerformanceObserver(touch).observe({type: 'resource', buffered: false});
+    } catch (e) {}
+  }
+})();
+"""
+
+READINESS_PROBE_JS = READINESS_INSTRUMENTATION_JS + """
+var state = window.__deepsearchReadiness;
+return {
+  readyState: document.readyState,
+  pending: state.pending,
+  quietFor: (performance.now() - state.lastActivity) / 1000
+};
+"""
+
+
+def install_readiness_instrumentation(driver: webdriver.Chrome):
+    """
+    Register the readiness instrumentation for every document loaded by the driver.
+
+    Args:
+        driver: The Chrome WebDriver to instrument
+    """
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                               {"source": READINESS_INSTRUMENTATION_JS})
+    except Exception as e:
+        # The probe installs itself lazily, only early activity is missed
+        print(f"Error installing readiness instrumentation: {e}")
+
+
+def wait_until_ready(driver: webdriver.Chrome,
+                     max_wait: float,
+                     quiet_period: float = 0.5,
+                     poll_interval: float = 0.1) -> float:
+    """
+    Wait until the current page is stable, or until max_wait has elapsed.
+
+    A page is considered stable once document.readyState is "complete", no
+    fetch/XHR request is pending and neither the DOM nor the network has shown
+    any activity for quiet_period seconds.
+
+    Args:
+        driver: The Chrome WebDriver showing the page
+        max_wait: Maximum time to wait in seconds
+        quiet_period: How long the page must stay idle to be considered ready
+        poll_interval: Time between two probes in seconds
+
+    Returns:
+        The time actually spent waiting, in seconds
+    """
+    start = time.monotonic()
+    while True:
+        elapsed = time.monotonic() - start
+        try:
+            state = driver.execute_script(READINESS_PROBE_JS) or {}
+        except Exception as e:
+            print(f"Error probing page readiness: {e}")
+            break
+
+        if (state.get("readyState") == "complete"
+                and not state.get("pending")
+                and state.get("quietFor", 0) >= quiet_period):
+            break
+        if elapsed >= max_wait:
+            break
+        time.sleep(min(poll_interval, max(max_wait - elapsed, 0)))
+
+    return time.monotonic() - start
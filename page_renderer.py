@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Conversion of fetched pages to markdown.
+These functions only depend on their arguments so that they can run in the worker
+processes of a ParsePool as well as in the calling thread.
+"""
+
+import re
+from typing import List, Optional, Tuple
+from bs4 import BeautifulSoup
+from content_scoring import analyze_page
+from domain_profiles import profile_for
+from html_parsers import parse_html
+from markdown_writer import bounded_text, element_to_markdown
+
+
+def extract_content(html: str, parser: str = 'html.parser', max_content_length: int = 20000,
+                    url: Optional[str] = None) -> Tuple[str, str, List[str], Optional[BeautifulSoup]]:
+    """
+    Extract the main content and subheadings from HTML.
+    
+    Pages from a domain with an extraction profile (see domain_profiles) use the
+    profile's content element and only that element is cleaned and analysed.
+    
+    Args:
+        html: HTML content as string
+        parser: HTML parser backend, see html_parsers.resolve_parser()
+        max_content_length: Maximum length of the main content text
+        url: URL of the page, used to pick its domain profile
+        
+    Returns:
+        Tuple containing (title, main content text, list of subheadings, main content element)
+    """
+    soup = parse_html(html, parser)
+    
+    profile = profile_for(url) if url else None
+    profile_element = profile.find_content(soup) if profile else None
+    if profile_element is not None:
+        # Known layout: no need to probe for the content
+        analysis = analyze_page(profile_element, probe=False)
+        title_tag = soup.title
+    else:
+        # Remove unwanted elements and collect everything else in a single pass
+        analysis = analyze_page(soup)
+        title_tag = analysis.title_tag
+    
+    # Extract title
+    title = ""
+    if title_tag and title_tag.text:
+        title = title_tag.text.strip()
+    
+    # Extract headings for structure
+    headings = []
+    for heading in analysis.heading_tags:
+        heading_text = heading.text.strip()
+        if heading_text:
+            headings.append((heading.name, heading_text))
+    
+    # Use the profile's content element, the first common content container (main, article,
+    # #content, ...), then the block with the best text score, then the whole body.
+    # Only the first max_content_length characters of text are read
+    main_content_text = ""
+    main_content_element = profile_element or analysis.container or analysis.best_block or analysis.body
+    if main_content_element is not None:
+        main_content_text = bounded_text(main_content_element, max_content_length)
+    
+    # Extract paragraphs and format for better readability
+    paragraphs = re.split(r'\n\s*\n', main_content_text)
+    formatted_content = '\n\n'.join(p.strip() for p in paragraphs if p.strip())
+    
+    # Extract extracted headings as a separate list
+    subheadings = [heading_text for _, heading_text in headings]
+    
+    return title, formatted_content, subheadings, main_content_element
+
+
+def to_markdown(url: str, title: str, content: str, subheadings: List[str], html_element: Optional[BeautifulSoup] = None,
+                max_content_length: Optional[int] = None) -> str:
+    """
+    Convert the extracted content to markdown format.
+    
+    The conversion of html_element stops after max_content_length characters of text,
+    like the plain-text content.
+    
+    Args:
+        url: The source URL
+        title: The page title
+        content: The main content text
+        subheadings: List of subheadings found in the content
+        html_element: Optional BeautifulSoup element containing the main content HTML
+        max_content_length: Maximum length of the main content text (None for no limit)
+        
+    Returns:
+        Markdown-formatted string
+    """
+    markdown = f"# {title}\n\n"
+    markdown += f"*Source: {url}*\n\n"
+    
+    # Add subheadings if available
+    if subheadings:
+        markdown += "## Table of Contents\n\n"
+        for heading in subheadings[:10]:  # Limit to top 10 headings
+            markdown += f"- {heading}\n"
+        markdown += "\n"
+    
+    # Add main content with proper formatting
+    markdown += "## Full Content\n\n"
+    
+    # Convert the parsed HTML element directly if we have it
+    if html_element:
+        markdown += element_to_markdown(html_element, max_content_length)
+    else:
+        # Fallback to the extracted text content
+        markdown += content
+    
+    return markdown
+
+
+def render_page(url: str, html: str, parser: str = 'html.parser', max_content_length: int = 20000) -> str:
+    """
+    Extract the content of a fetched page and convert it to markdown.
+    
+    Args:
+        url: The source URL
+        html: HTML content as string
+        parser: HTML parser backend, see html_parsers.resolve_parser()
+        max_content_length: Maximum length of the main content text
+        
+    Returns:
+        Markdown-formatted string
+    """
+    title, content, subheadings, html_element = extract_content(html, parser, max_content_length, url)
+    return to_markdown(url, title, content, subheadings, html_element, max_content_length)
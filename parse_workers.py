@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+ParsePool module for running page parsing and markdown conversion in worker processes.
+Parsing is CPU-bound and holds the GIL, so doing it in the fetching threads stalls page
+loads; worker processes let it scale with the number of cores. Each page gets a timeout,
+after which the workers are killed and replaced so one pathological page cannot wedge
+the pipeline. Workers replay the domain profiles registered in the parent process, and
+are replaced when profiles are registered after they started.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from domain_profiles import load_profiles, registered_profiles
+from page_renderer import render_page
+
+
+def default_parse_workers() -> int:
+    """Return the default number of parse processes (one per core, at most 4)."""
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+class ParsePool:
+    """
+    A class to render pages to markdown in a pool of worker processes.
+    """
+
+    def __init__(self, workers: int = 2, timeout: float = 30):
+        """
+        Initialize the ParsePool. Worker processes are started on first use.
+
+        Args:
+            workers: Number of worker processes
+            timeout: Maximum time in seconds spent rendering one page
+        """
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Registration counter of the domain profiles loaded by the current workers
+        self._profiles_version = 0
+        self._lock = threading.Lock()
+        # "spawn" because forking a process that runs browser and HTTP threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            version, specs = registered_profiles()
+            if self._executor is not None and self._profiles_version != version:
+                # Profiles were registered since the workers started: pages already
+                # submitted finish on the old workers, new ones go to workers that know them
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._executor is None:
+                self._profiles_version = version
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._context,
+                                                     initializer=load_profiles, initargs=(specs,))
+            return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor, stuck: bool = False):
+        """
+        Kill the workers of an executor and replace it, unless another thread already did.
+
+        Args:
+            executor: The executor whose workers failed
+            stuck: One of its workers hangs, kill it even if the executor was already replaced
+        """
+        with self._lock:
+            current = self._executor is executor
+            if current:
+                self._executor = None
+        if not current and not stuck:
+            return
+        # A running task cannot be cancelled, only its process can be killed
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            try:
+                process.kill()
+            except Exception as e:
+                print(f"Error stopping parse worker: {e}")
+
+    def render(self, url: str, html: str, parser: str, max_content_length: int) -> str:
+        """
+        Render a page to markdown in a worker process, see page_renderer.render_page().
+
+        Args:
+            url: The source URL
+            html: HTML content as string
+            parser: HTML parser backend
+            max_content_length: Maximum length of the main content text
+
+        Returns:
+            Markdown-formatted string
+
+        Raises:
+            TimeoutError: If rendering took longer than the timeout
+        """
+        # Pages in flight when the workers are killed for another page's timeout get one retry
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                # Raises BrokenProcessPool (or RuntimeError once shut down) if the workers were killed
+                future = executor.submit(render_page, url, html, parser, max_content_length)
+            except RuntimeError:
+                self._restart(executor)
+                continue
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                self._restart(executor, stuck=True)
+                raise TimeoutError(f"Rendering {url} took more than {self.timeout}s")
+            except BrokenProcessPool:
+                self._restart(executor)
+                if attempt:
+                    raise
+        raise BrokenProcessPool(f"Parse workers failed while rendering {url}")
+
+    def close(self):
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
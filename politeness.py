@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Per-host politeness scheduling for page fetches.
+Every request to a host goes through a slot that caps concurrent requests per host, applies
+a token-bucket rate limit (slowed down further by the robots.txt crawl-delay), and backs off
+when the host answers 429/503.
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+from http_fetcher import HttpFetcher
+
+
+class _HostState:
+    """Rate-limiting state of a single host."""
+
+    def __init__(self, max_concurrent: int, burst: float):
+        self.semaphore = threading.BoundedSemaphore(max_concurrent)
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.crawl_delay: Optional[float] = None
+        self.robots_checked = False
+        self.robots_lock = threading.Lock()
+
+
+def host_of(url: str) -> str:
+    """Return the lower-cased host name of a URL."""
+    return (urlsplit(url).hostname or "").lower()
+
+
+class HostScheduler:
+    """
+    A class to keep page fetches polite towards each host.
+    """
+
+    def __init__(self,
+                 max_per_host: int = 2,
+                 requests_per_second: float = 2.0,
+                 burst: int = 4,
+                 respect_robots: bool = True,
+                 http: Optional[HttpFetcher] = None,
+                 max_backoff: float = 120.0):
+        """
+        Initialize the HostScheduler.
+
+        Args:
+            max_per_host: Maximum number of requests in flight to the same host
+            requests_per_second: Sustained request rate allowed per host
+            burst: Number of requests that may be sent at once before the rate limit applies
+            respect_robots: Whether to honour the Crawl-delay of the host's robots.txt
+            http: HttpFetcher used to download robots.txt files
+            max_backoff: Upper bound of the backoff applied after 429/503 answers, in seconds
+        """
+        self.max_per_host = max(1, max_per_host)
+        self.requests_per_second = requests_per_second
+        self.burst = max(1, burst)
+        self.respect_robots = respect_robots
+        self.http = http or HttpFetcher()
+        self.max_backoff = max_backoff
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.max_per_host, self.burst)
+            return state
+
+    def _load_robots(self, url: str, state: _HostState):
+        """Fetch the host's robots.txt once and remember its crawl-delay."""
+        with state.robots_lock:
+            if state.robots_checked:
+                return
+            state.robots_checked = True
+            parts = urlsplit(url)
+            response = self.http.get(f"{parts.scheme}://{parts.netloc}/robots.txt")
+            if response is None or response.status_code != 200:
+                return
+            parser = RobotFileParser()
+            parser.parse(response.text.splitlines())
+            delay = parser.crawl_delay(self.http.session.headers.get("User-Agent", "*"))
+            if delay is None:
+                delay = parser.crawl_delay("*")
+            if delay:
+                state.crawl_delay = float(delay)
+
+    def _reserve(self, state: _HostState) -> float:
+        """Take a token from the host's bucket and return how long to wait before using it."""
+        rate = self.requests_per_second
+        if state.crawl_delay:
+            rate = min(rate, 1.0 / state.crawl_delay)
+        with self._lock:
+            now = time.monotonic()
+            state.tokens = min(self.burst, state.tokens + (now - state.updated) * rate)
+            state.updated = now
+            state.tokens -= 1
+            wait = -state.tokens / rate if state.tokens < 0 else 0.0
+            return max(wait, state.blocked_until - now)
+
+    @contextmanager
+    def slot(self, url: str, hold: bool = True) -> Iterator[None]:
+        """
+        Wait until a request to the URL's host is allowed, and hold a slot while it runs.
+
+        Args:
+            url: URL about to be fetched
+            hold: Whether the request takes one of the host's max_per_host slots; False only
+                rate-limits it, for a request racing a fetch of the same page that holds one
+        """
+        state = self._state(host_of(url))
+        if self.respect_robots and not state.robots_checked:
+            self._load_robots(url, state)
+
+        with state.semaphore if hold else nullcontext():
+            wait = self._reserve(state)
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+    def report(self, url: str, status_code: int, retry_after: Optional[str] = None):
+        """
+        Record the status of a response so that throttled hosts get backed off.
+
+        Args:
+            url: URL that was fetched
+            status_code: HTTP status of the response
+            retry_after: Retry-After header of the response, if any
+        """
+        state = self._state(host_of(url))
+        with self._lock:
+            if status_code not in (429, 503):
+                state.failures = 0
+                return
+            state.failures += 1
+            delay = min(self.max_backoff, 2.0 ** state.failures)
+            parsed = self._parse_retry_after(retry_after)
+            if parsed is not None:
+                delay = min(self.max_backoff, max(delay, parsed))
+            state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+        print(f"{host_of(url)} answered {status_code}, backing off for {delay:.0f}s")
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def interleave(urls: List[str]) -> List[int]:
+        """
+        Order URLs round-robin by host so that concurrent workers hit different hosts.
+
+        Args:
+            urls: URLs to schedule
+
+        Returns:
+            Indices into urls, in the order they should be started
+        """
+        by_host: Dict[str, List[int]] = {}
+        for index, url in enumerate(urls):
+            by_host.setdefault(host_of(url), []).append(index)
+
+        order = []
+        queues = list(by_host.values())
+        while queues:
+            for queue in queues:
+                order.append(queue.pop(0))
+            queues = [queue for queue in queues if queue]
+        return order
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Resource blocking for Selenium-driven pages.
+Only the text of a page is ever extracted, so images, fonts, media and ad/analytics scripts
+are blocked through the Chrome DevTools Protocol before they are downloaded.
+"""
+
+import weakref
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+from selenium import webdriver
+
+
+RESOURCE_EXTENSIONS: Dict[str, List[str]] = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "avif", "bmp", "ico"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "mp3", "ogg", "m4a", "mov", "avi", "m3u8"],
+}
+
+
+def _extension_patterns(extensions: List[str]) -> List[str]:
+    """Patterns matching paths that end with one of the extensions, with or without a query string."""
+    # Anchored to the end of the path: "*.gif*" would also block https://www.gifi.fr/ itself
+    return [pattern for extension in extensions for pattern in (f"*.{extension}", f"*.{extension}?*")]
+
+
+RESOURCE_PATTERNS: Dict[str, List[str]] = {
+    resource_type: _extension_patterns(extensions) for resource_type, extensions in RESOURCE_EXTENSIONS.items()
+}
+
+# Ad and analytics hosts seen on the sites we crawl
+TRACKER_HOSTS: List[str] = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "adservice.google.com", "facebook.net", "connect.facebook.net",
+    "hotjar.com", "clarity.ms", "xiti.com", "ati-host.net", "eulerian.net", "scorecardresearch.com",
+    "criteo.com", "criteo.net", "smartadserver.com", "taboola.com", "outbrain.com",
+    "ads-twitter.com", "analytics.tiktok.com", "mixpanel.com", "segment.io", "quantserve.com",
+]
+
+DEFAULT_BLOCKED_TYPES: Tuple[str, ...] = ("image", "font", "media", "tracker")
+
+
+def _host_matches(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+class ResourceBlocker:
+    """
+    A class to decide which subresources a page may load and apply that to a driver.
+    """
+
+    def __init__(self,
+                 blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+                 domain_overrides: Optional[Dict[str, Iterable[str]]] = None,
+                 tracker_hosts: Optional[Iterable[str]] = None):
+        """
+        Initialize the ResourceBlocker.
+
+        Args:
+            blocked_types: Resource types to block ("image", "font", "media", "tracker")
+            domain_overrides: Resource types allowed again on pages of a given domain,
+                e.g. {"service-public.fr": ["image"]}
+            tracker_hosts: Hosts blocked by the "tracker" type (defaults to TRACKER_HOSTS)
+        """
+        self.blocked_types = set(blocked_types)
+        self.domain_overrides = {domain: set(types) for domain, types in (domain_overrides or {}).items()}
+        self.tracker_hosts = list(tracker_hosts) if tracker_hosts is not None else list(TRACKER_HOSTS)
+        self._patterns_by_host: Dict[str, Tuple[str, ...]] = {}
+        # Patterns currently applied to each driver, to skip redundant CDP calls
+        self._applied = weakref.WeakKeyDictionary()
+
+    def patterns_for(self, url: str) -> Tuple[str, ...]:
+        """
+        Return the URL patterns to block while loading a page.
+
+        Args:
+            url: URL of the page about to be loaded
+
+        Returns:
+            Tuple of Network.setBlockedURLs wildcard patterns
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        patterns = self._patterns_by_host.get(host)
+        if patterns is not None:
+            return patterns
+
+        types = set(self.blocked_types)
+        for domain, allowed in self.domain_overrides.items():
+            if _host_matches(host, domain):
+                types -= allowed
+
+        result: List[str] = []
+        for resource_type in sorted(types):
+            if resource_type == "tracker":
+                # The host itself and its subdomains, not any URL containing the name
+                for tracker in self.tracker_hosts:
+                    result.extend((f"*://{tracker}/*", f"*://*.{tracker}/*"))
+            else:
+                result.extend(RESOURCE_PATTERNS.get(resource_type, []))
+        patterns = tuple(result)
+        self._patterns_by_host[host] = patterns
+        return patterns
+
+    def enable(self, driver: webdriver.Chrome):
+        """Enable the CDP network domain on a new driver."""
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+        except Exception as e:
+            print(f"Error enabling resource blocking: {e}")
+
+    def apply(self, driver: webdriver.Chrome, url: str):
+        """
+        Configure the driver to block the right resources for the page about to be loaded.
+
+        Args:
+            driver: The Chrome WebDriver that will load the page
+            url: URL of the page
+        """
+        patterns = self.patterns_for(url)
+        if self._applied.get(driver) == patterns:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+            self._applied[driver] = patterns
+        except Exception as e:
+            print(f"Error applying resource blocking for {url}: {e}")
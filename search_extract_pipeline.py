@@ -6,7 +6,7 @@ This module combines GoogleSearcher and SeleniumExtractor to create a full pipel
 for processing AI-generated questions, retrieving relevant URLs, and extracting content.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
 import json
 from GoogleSearcher import GoogleSearcher
@@ -24,7 +24,9 @@ class SearchExtractPipeline:
                  max_results_per_query: int = 3,
                  headless: bool = True,
                  wait_time: int = 3,
-                 scroll_page: bool = True):
+                 scroll_page: bool = True,
+                 pool_size: int = 3,
+                 cache_dir: Optional[str] = None):
         """
         Initialize the pipeline.
         
@@ -35,9 +37,13 @@ class SearchExtractPipeline:
             headless: Whether to run browser in headless mode
             wait_time: Time to wait after page load for dynamic content to render
             scroll_page: Whether to scroll the page to load lazy-loaded content
+            pool_size: Number of browsers used concurrently to extract the URLs of a question
+            cache_dir: Directory of the on-disk page cache shared between runs (None disables it)
         """
         self.searcher = GoogleSearcher(target_domain=target_domain)
-        self.extractor = SeleniumExtractor(headless=headless, wait_time=wait_time, scroll_page=scroll_page)
+        self.extractor = SeleniumExtractor(headless=headless, wait_time=wait_time,
+                                           scroll_page=scroll_page, pool_size=pool_size,
+                                           cache_dir=cache_dir)
         self.output_dir = output_dir
         self.max_results_per_query = max_results_per_query
         
@@ -62,8 +68,9 @@ class SearchExtractPipeline:
             num_results_per_query=self.max_results_per_query
         )
         
-        # Step 2: Extract content from URLs
+        # Step 2: Extract content from URLs, fetching pages shared by several questions once
         print("Extracting content from URLs...")
+        extracted = self.extractor.process_url_groups(search_results)
         
         all_results = {}
         
@@ -76,9 +83,6 @@ class SearchExtractPipeline:
             print(f"\nProcessing question {question_idx+1}/{len(questions)}")
             print(f"Found {len(urls)} URLs for: {question}")
             
-            # Process the URLs for this question
-            markdown_contents = self.extractor.process_urls(urls)
-            
             # Save content to files
             question_filename = "".join(c if c.isalnum() else "_" for c in question)[:30]
             markdown_files = []
@@ -86,7 +90,7 @@ class SearchExtractPipeline:
             # Only save for successful extractions
             successful_urls = []
             
-            for url_idx, (url, content) in enumerate(zip(urls, markdown_contents)):
+            for url_idx, (url, content) in enumerate(extracted[question].items()):
                 if content:
                     successful_urls.append(url)
                     filename = f"{question_filename}_{url_idx+1}.md"
@@ -131,21 +135,14 @@ class SearchExtractPipeline:
             num_results_per_query=self.max_results_per_query
         )
         
-        # Step 2: Extract content from URLs
-        markdown_results = {}
+        # Step 2: Extract content from URLs, fetching pages shared by several questions once
+        extracted = self.extractor.process_url_groups(search_results)
         
-        for question, urls in search_results.items():
-            if not urls:
-                markdown_results[question] = []
-                continue
-                
-            # Process the URLs for this question
-            markdown_contents = self.extractor.process_urls(urls)
-            
-            # Filter out None results
-            markdown_results[question] = [
-                content for content in markdown_contents if content
-            ]
+        # Filter out None results
+        markdown_results = {
+            question: [content for content in contents.values() if content]
+            for question, contents in extracted.items()
+        }
         
         return markdown_results
 
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Tab multiplexing: several concurrent page loads served by one Chrome process.
+A Chrome instance per concurrent page costs hundreds of MB, while an extra tab only costs a
+renderer. A BrowserTab looks like a WebDriver to the rest of the code (and to DriverPool),
+but forwards every command to its window of a shared browser under the browser's lock.
+Pages are navigated from JavaScript and waited for by polling, so the lock is only held for
+single commands and each tab keeps its own load timeout.
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchWindowException, TimeoutException, WebDriverException
+
+
+# Leave a marker in the current document: it disappears once the new one is committed
+TAB_NAVIGATE_JS = "window.__tabNavigating = true; window.location.href = arguments[0];"
+TAB_LOADED_JS = "return window.__tabNavigating === undefined && document.readyState === 'complete';"
+
+# Chrome slows down timers and rendering in background tabs, which every tab but one is
+TAB_BROWSER_ARGUMENTS = [
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+]
+
+
+class SharedBrowser:
+    """
+    A Chrome WebDriver shared by several tabs.
+    """
+
+    def __init__(self, driver: webdriver.Chrome, max_tabs: int, max_pages: int = 0):
+        """
+        Initialize the SharedBrowser.
+
+        Args:
+            driver: The WebDriver of the browser
+            max_tabs: Maximum number of tabs open at the same time
+            max_pages: Number of pages after which no new tab is opened, so the browser
+                is quit once its last tab closes (0 disables recycling)
+        """
+        self.driver = driver
+        self.max_tabs = max_tabs
+        self.max_pages = max_pages
+        # Serialises WebDriver commands, which always target the current window
+        self.lock = threading.Lock()
+        self.current_handle: Optional[str] = driver.current_window_handle
+        self._unused_handle: Optional[str] = self.current_handle
+        self.tabs = 0
+        self.pages = 0
+        self.retiring = False
+
+    def accepts_tabs(self) -> bool:
+        """Tell whether a new tab may be opened in this browser."""
+        return not self.retiring and self.tabs < self.max_tabs
+
+    def open_window(self) -> str:
+        """Open a tab (or take over the browser's first window) and return its handle."""
+        with self.lock:
+            if self._unused_handle is not None:
+                handle, self._unused_handle = self._unused_handle, None
+                return handle
+            self.driver.switch_to.new_window("tab")
+            self.current_handle = self.driver.current_window_handle
+            return self.current_handle
+
+    def count_page(self):
+        self.pages += 1
+        if self.max_pages and self.pages >= self.max_pages:
+            self.retiring = True
+
+
+class BrowserTab:
+    """
+    A WebDriver-like handle on one tab of a SharedBrowser.
+    """
+
+    def __init__(self, browser: SharedBrowser, handle: str, release: Callable[[SharedBrowser], bool]):
+        """
+        Initialize the BrowserTab.
+
+        Args:
+            browser: The browser owning the tab
+            handle: WebDriver window handle of the tab
+            release: Gives the tab's slot back to the browser, returning True for its last tab
+        """
+        self.browser = browser
+        self.handle = handle
+        self.page_load_timeout = 30.0
+        self._release = release
+
+    def _focus(self):
+        """Make the tab the target of WebDriver commands (caller holds the browser lock)."""
+        if self.browser.current_handle != self.handle:
+            self.browser.driver.switch_to.window(self.handle)
+            self.browser.current_handle = self.handle
+
+    def execute_script(self, script: str, *args):
+        with self.browser.lock:
+            self._focus()
+            return self.browser.driver.execute_script(script, *args)
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict):
+        with self.browser.lock:
+            self._focus()
+            return self.browser.driver.execute_cdp_cmd(cmd, cmd_args)
+
+    def find_element(self, by: str, value: Optional[str] = None):
+        with self.browser.lock:
+            self._focus()
+            return self.browser.driver.find_element(by, value)
+
+    @property
+    def page_source(self) -> str:
+        with self.browser.lock:
+            self._focus()
+            return self.browser.driver.page_source
+
+    def set_page_load_timeout(self, time_to_wait: float):
+        self.page_load_timeout = time_to_wait
+
+    def get(self, url: str, poll_interval: float = 0.1):
+        """
+        Load a page in the tab without blocking the other tabs.
+
+        Raises:
+            TimeoutException: If the page did not finish loading within the page load timeout
+        """
+        self.browser.count_page()
+        self.execute_script(TAB_NAVIGATE_JS, url)
+        deadline = time.monotonic() + self.page_load_timeout
+        while time.monotonic() < deadline:
+            try:
+                if self.execute_script(TAB_LOADED_JS):
+                    return
+            except NoSuchWindowException:
+                raise
+            except WebDriverException:
+                # The document is being replaced
+                pass
+            time.sleep(poll_interval)
+        try:
+            self.execute_script("window.stop();")
+        except WebDriverException:
+            pass
+        raise TimeoutException(f"Page load timed out after {self.page_load_timeout}s")
+
+    def quit(self):
+        """Close the tab; the browser is quit along with its last tab."""
+        browser = self.browser
+        try:
+            if self._release(browser):
+                browser.driver.quit()
+                return
+            with browser.lock:
+                self._focus()
+                browser.driver.close()
+                browser.current_handle = None
+        except Exception as e:
+            # The browser is probably gone, do not open new tabs in it
+            browser.retiring = True
+            print(f"Error closing tab: {e}")
+
+
+class _StartingBrowser:
+    """
+    A browser being started, whose tabs are already promised to the callers waiting for it.
+    """
+
+    def __init__(self):
+        self.tabs = 1
+        self.ready = threading.Event()
+        self.browser: Optional[SharedBrowser] = None
+
+
+class TabFactory:
+    """
+    A DriverPool factory handing out tabs, opening a new browser when the others are full.
+    """
+
+    def __init__(self, browser_factory: Callable[[], webdriver.Chrome],
+                 prepare_tab: Callable[[BrowserTab], None],
+                 tabs_per_browser: int = 4,
+                 max_pages_per_browser: int = 0,
+                 page_load_timeout: float = 30):
+        """
+        Initialize the TabFactory.
+
+        Args:
+            browser_factory: Callable starting a new Chrome WebDriver
+            prepare_tab: Called on every new tab (CDP settings are per tab)
+            tabs_per_browser: Maximum number of tabs open in one browser
+            max_pages_per_browser: Number of pages after which a browser is retired (0 disables it)
+            page_load_timeout: Time in seconds after which a page load in a tab is abandoned
+        """
+        self.browser_factory = browser_factory
+        self.prepare_tab = prepare_tab
+        self.tabs_per_browser = max(1, tabs_per_browser)
+        self.max_pages_per_browser = max_pages_per_browser
+        self.page_load_timeout = page_load_timeout
+        self._browsers: List[SharedBrowser] = []
+        self._starting: List[_StartingBrowser] = []
+        self._lock = threading.Lock()
+
+    def _reserve_tab(self) -> SharedBrowser:
+        """
+        Reserve a tab slot: in a running browser with room, else in a browser being started
+        by another caller (waiting for it), else in a new browser started by this caller.
+
+        Raises:
+            Exception: Whatever the browser factory raised when this caller started the browser
+        """
+        while True:
+            owner = False
+            with self._lock:
+                for browser in self._browsers:
+                    if browser.accepts_tabs():
+                        browser.tabs += 1
+                        return browser
+                for starting in self._starting:
+                    if starting.tabs < self.tabs_per_browser:
+                        starting.tabs += 1
+                        break
+                else:
+                    starting = _StartingBrowser()
+                    self._starting.append(starting)
+                    owner = True
+
+            if not owner:
+                starting.ready.wait()
+                if starting.browser is not None:
+                    return starting.browser
+                # The start failed, try again (possibly starting a browser ourselves)
+                continue
+
+            try:
+                # Started outside the lock so that browsers can start in parallel
+                browser = SharedBrowser(self.browser_factory(), self.tabs_per_browser, self.max_pages_per_browser)
+            except Exception:
+                with self._lock:
+                    self._starting.remove(starting)
+                starting.ready.set()
+                raise
+            with self._lock:
+                self._starting.remove(starting)
+                browser.tabs = starting.tabs
+                self._browsers.append(browser)
+            starting.browser = browser
+            starting.ready.set()
+            return browser
+
+    def _release_tab(self, browser: SharedBrowser) -> bool:
+        """Give a tab slot back, forgetting the browser with its last tab. Returns True for the last tab."""
+        with self._lock:
+            browser.tabs -= 1
+            if browser.tabs > 0:
+                return False
+            browser.retiring = True
+            if browser in self._browsers:
+                self._browsers.remove(browser)
+            return True
+
+    def __call__(self) -> BrowserTab:
+        browser = self._reserve_tab()
+        try:
+            tab = BrowserTab(browser, browser.open_window(), self._release_tab)
+        except Exception:
+            browser.retiring = True
+            if self._release_tab(browser):
+                try:
+                    browser.driver.quit()
+                except Exception as e:
+                    print(f"Error closing driver: {e}")
+            raise
+        tab.set_page_load_timeout(self.page_load_timeout)
+        self.prepare_tab(tab)
+        return tab
+
+    def close(self):
+        """Quit every browser still open."""
+        with self._lock:
+            browsers, self._browsers = self._browsers, []
+        for browser in browsers:
+            try:
+                browser.driver.quit()
+            except Exception as e:
+                print(f"Error closing driver: {e}")
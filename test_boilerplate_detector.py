@@ -0,0 +1,88 @@
+import json
+from boilerplate_detector import BoilerplateDetector
+
+MENU = "Home | Products | Services | Contact us | Legal notice"
+FOOTER = "Copyright Example Corp, all rights reserved since 1998."
+
+
+def page(index):
+    return "\n\n".join([
+        MENU,
+        "## Latest news",
+        "Short",
+        f"Article number {index} talks about a subject that no other page covers.",
+        FOOTER,
+    ])
+
+
+def test_repeated_blocks_are_stripped_from_the_min_pages_th_page():
+    detector = BoilerplateDetector(min_pages=3)
+
+    results = [detector.strip(f"https://www.example.com/article/{i}", page(i)) for i in range(4)]
+
+    assert [removed for _, removed in results] == [0, 0, 2, 2]
+    for markdown, _ in results[:2]:
+        assert MENU in markdown and FOOTER in markdown
+    for i, (markdown, _) in enumerate(results[2:], start=2):
+        assert markdown == "\n\n".join([
+            "## Latest news",
+            "Short",
+            f"Article number {i} talks about a subject that no other page covers.",
+        ])
+
+
+def test_headings_and_short_blocks_are_kept():
+    detector = BoilerplateDetector(min_pages=2, min_block_length=20)
+    markdown = "## Same heading on every page\n\nRead more\n\n" + MENU
+
+    for i in range(5):
+        stripped, removed = detector.strip(f"https://example.com/{i}", markdown)
+
+    assert removed == 1
+    assert stripped == "## Same heading on every page\n\nRead more"
+
+
+def test_same_page_is_counted_once():
+    detector = BoilerplateDetector(min_pages=2)
+
+    for url in ["https://example.com/a", "https://example.com/a/", "https://example.com/a?utm_source=x"]:
+        _, removed = detector.strip(url, page(0))
+        assert removed == 0
+
+    _, removed = detector.strip("https://example.com/b", page(1))
+    assert removed == 2
+
+
+def test_domains_are_learned_separately():
+    detector = BoilerplateDetector(min_pages=2)
+    detector.strip("https://example.com/a", page(0))
+
+    _, removed = detector.strip("https://other.example.org/a", page(1))
+
+    assert removed == 0
+
+
+def test_store_round_trip(tmp_path):
+    store = tmp_path / "boilerplate" / "store.json"
+    detector = BoilerplateDetector(str(store), min_pages=3, save_every=100)
+    detector.strip("https://example.com/1", page(1))
+    detector.strip("https://example.com/2", page(2))
+    assert not store.exists()
+
+    detector.save()
+
+    assert "example.com" in json.loads(store.read_text(encoding="utf-8"))
+    reloaded = BoilerplateDetector(str(store), min_pages=3)
+    markdown, removed = reloaded.strip("https://example.com/3", page(3))
+    assert removed == 2
+    assert MENU not in markdown
+
+
+def test_store_is_saved_every_save_every_pages(tmp_path):
+    store = tmp_path / "store.json"
+    detector = BoilerplateDetector(str(store), save_every=2)
+
+    detector.strip("https://example.com/1", page(1))
+    assert not store.exists()
+    detector.strip("https://example.com/2", page(2))
+    assert store.exists()
@@ -0,0 +1,39 @@
+import pytest
+from bs4 import BeautifulSoup
+from content_scoring import analyze_page, is_boilerplate
+from page_renderer import extract_content
+
+
+@pytest.mark.parametrize("classes, expected", [
+    ("sidebar", True),
+    ("widget sidebar", True),
+    ("share-buttons", True),
+    ("ads", True),
+    ("has-sidebar", False),
+    ("sidebar-open", False),
+    ("share-buttons-count", False),
+    ("cookie-consent", True),
+])
+def test_is_boilerplate_class_names(classes, expected):
+    tag = BeautifulSoup(f'<div class="{classes}"></div>', "html.parser").div
+    assert is_boilerplate(tag) is expected
+
+
+def test_body_with_sidebar_class_is_kept():
+    """WordPress-style body classes must not remove the whole page."""
+    html = ('<html><head><title>T</title></head><body class="post has-sidebar">'
+            '<div class="sidebar"><p>Archives</p></div>'
+            '<p>' + 'Some real content. ' * 20 + '</p></body></html>')
+    title, content, _, element = extract_content(html, "html.parser")
+
+    assert element is not None
+    assert "Some real content." in content
+    assert "Archives" not in content
+
+
+def test_analyze_page_removes_boilerplate():
+    soup = BeautifulSoup('<body><nav>Menu</nav><main><p>Text</p></main></body>', "html.parser")
+    analysis = analyze_page(soup)
+
+    assert soup.find("nav") is None
+    assert analysis.container is soup.main
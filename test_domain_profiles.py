@@ -0,0 +1,74 @@
+import os
+import pytest
+from domain_profiles import DOMAIN_PROFILES, load_profiles, profile_for, register_profile, registered_profiles
+from page_renderer import extract_content
+from parse_workers import ParsePool
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_pages")
+
+
+def read_page(name):
+    with open(os.path.join(PAGES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("url, domain", [
+    ("https://www.economie.gouv.fr/entreprises/logiciels-caisse", "economie.gouv.fr"),
+    ("https://entreprendre.service-public.fr/vosdroits/F2974", "service-public.fr"),
+    ("https://fr.wikipedia.org/wiki/Web_scraping", "wikipedia.org"),
+    ("https://example.org/page", None),
+    ("https://notwikipedia.org/wiki/Page", None),
+])
+def test_profile_for_matches_domain_and_subdomains(url, domain):
+    profile = profile_for(url)
+    assert (profile.domain if profile else None) == domain
+
+
+@pytest.mark.parametrize("page, url, dropped", [
+    ("economie_gouv_systemes_caisse.html", "https://www.economie.gouv.fr/entreprises/x", "Partager sur Facebook"),
+    ("service_public_no_container.html", "https://www.service-public.fr/particuliers/vosdroits/F1", "Avez-vous trouvé"),
+    ("wikipedia_web_scraping.html", "https://en.wikipedia.org/wiki/Web_scraping", "Contents"),
+])
+def test_profile_extracts_content_without_boilerplate(page, url, dropped):
+    """Profiled pages keep the same title and main text as the generic heuristic, minus the dropped elements."""
+    generic_title, generic_content, _, _ = extract_content(read_page(page), "html.parser")
+    title, content, _, _ = extract_content(read_page(page), "html.parser", url=url)
+
+    assert title == generic_title
+    assert dropped not in content
+    paragraphs = [p for p in content.split("\n\n") if len(p) > 40]
+    assert paragraphs
+    assert all(p in generic_content for p in paragraphs)
+
+
+RUNTIME_PAGE = """<html><head><title>Runtime</title></head><body>
+<div class="layout"><div class="story">Profiled story text. <span class="ad">Buy now</span></div>
+<div class="other">""" + "Much longer unrelated text. " * 30 + """</div></div></body></html>"""
+
+
+def test_profile_specs_round_trip():
+    version, specs = registered_profiles()
+    profile = DOMAIN_PROFILES["wikipedia.org"]
+    assert profile.spec() in specs
+
+    load_profiles([profile.spec()])
+
+    assert registered_profiles()[0] > version
+    assert DOMAIN_PROFILES["wikipedia.org"].spec() == profile.spec()
+
+
+def test_runtime_profile_is_used_by_parse_workers():
+    """Workers started before a registration are replaced by workers that know the new profile."""
+    url = "https://www.runtime-profile.example/story"
+    pool = ParsePool(workers=1, timeout=60)
+    try:
+        assert "Much longer unrelated text." in pool.render(url, RUNTIME_PAGE, "html.parser", 20000)
+
+        register_profile("runtime-profile.example", [".story"], [".ad"])
+        markdown = pool.render(url, RUNTIME_PAGE, "html.parser", 20000)
+    finally:
+        pool.close()
+
+    assert "Profiled story text." in markdown
+    assert "Buy now" not in markdown
+    assert "Much longer unrelated text." not in markdown
@@ -0,0 +1,64 @@
+import pytest
+from bs4 import BeautifulSoup
+from markdown_writer import bounded_text, element_to_markdown
+
+
+def convert(html, max_chars=None):
+    return element_to_markdown(BeautifulSoup(html, "html.parser"), max_chars)
+
+
+@pytest.mark.parametrize("html, expected", [
+    # Headings, whitespace collapsed, empty ones dropped
+    ("<h1>Title</h1><h2>  Sub   <em>title</em> </h2><h3> </h3><h4><span></span></h4><p>Text</p>",
+     "# Title\n\n## Sub *title*\n\nText\n"),
+    ("<h2><div>a</div><div>b</div></h2>", "## a b\n"),
+    # Nested lists
+    ("<ul><li>One</li><li>Two<ul><li>Two a</li><li>Two b<ol><li>deep</li></ol></li></ul></li>"
+     "<li><p>Three</p><p>more</p></li></ul>",
+     "- One\n- Two\n  - Two a\n  - Two b\n    1. deep\n- Three\n  more\n"),
+    ("<ul><li>A</li><ul><li>A1</li></ul><li>B</li></ul>", "- A\n  - A1\n- B\n"),
+    # Ordered list start
+    ('<ol start="3"><li>Third</li><li>Fourth</li></ol><ol start="x"><li>A</li></ol>',
+     "3. Third\n4. Fourth\n\n1. A\n"),
+    # Tables, pipes escaped, short rows padded, nested tables flattened into their cell
+    ("<table><tr><th>Name</th><th>Value</th></tr>"
+     "<tr><td>a|b</td><td><table><tr><td>inner</td><td>cell</td></tr><tr><td>row 2</td></tr></table></td></tr>"
+     "<tr><td>only</td></tr></table>",
+     "| Name | Value |\n| --- | --- |\n| a\\|b | inner cell row 2 |\n| only |  |\n"),
+    ("<table><tr><td> </td></tr></table><p>After</p>", "After\n"),
+    # Code
+    ("<pre>\ndef f():\n    return 1\n</pre><p>Use <code>f()</code> here.</p>",
+     "```\ndef f():\n    return 1\n```\n\nUse `f()` here.\n"),
+    # Links, javascript: and fragment links reduced to their text
+    ('<p><a href="https://ex.com/a">Real</a> <a href="javascript:void(0)">JS</a> '
+     '<a href="#top">Top</a><a href="/rel"> Spaced </a><a href="/empty"> </a></p>',
+     "[Real](https://ex.com/a) JS Top [Spaced](/rel)\n"),
+    # Inline markup, line breaks, images, quotes, rules, skipped tags
+    ('<p><strong>bold</strong>, <em>it</em>,<br>line two<img src="i.png" alt="pic"><img alt="none"></p>'
+     '<blockquote><p>Q1</p><p>Q2</p></blockquote><hr><div>a<script>x</script>b</div>',
+     "**bold**, *it*,\nline two![pic](i.png)\n\n> Q1\n>\n> Q2\n\n---\n\nab\n"),
+    ("<div> </div>", ""),
+    # Blocks met inline and adjacent spaces collapse to a single space
+    ("<p><span><div>a</div><div>b</div></span></p>", "a b\n"),
+    ('<p>x <a href="/y"><div>Card</div><div>title</div></a> z</p>', "x [Card title](/y) z\n"),
+    ("<p>a <b> b </b> c<br> <em> d </em></p>", "a **b** c\n*d*\n"),
+])
+def test_element_to_markdown(html, expected):
+    assert convert(html) == expected
+
+
+@pytest.mark.parametrize("max_chars, expected", [
+    (None, "# Hello\n\nWorld wide web\n\nNever\n"),
+    (5, "# Hello\n\n...\n"),
+    (12, "# Hello\n\nWorld w\n\n...\n"),
+    (24, "# Hello\n\nWorld wide web\n\nNever\n"),
+])
+def test_max_chars_truncation(max_chars, expected):
+    assert convert("<h1>Hello</h1><p>World wide web</p><p>Never</p>", max_chars) == expected
+
+
+def test_bounded_text():
+    soup = BeautifulSoup("<p>Hello</p><p>World wide web</p>", "html.parser")
+
+    assert bounded_text(soup) == "Hello\n\nWorld wide web"
+    assert bounded_text(soup, 9) == "Hello\n\nWo..."
@@ -0,0 +1,42 @@
+import os
+import pytest
+from html_parsers import available_parsers
+from SeleniumExtractor import SeleniumExtractor
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_pages")
+PAGES = sorted(name for name in os.listdir(PAGES_DIR) if name.endswith(".html"))
+
+
+def read_page(name):
+    with open(os.path.join(PAGES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def extract(parser, name):
+    """Run extract_content and to_markdown on a sample page with the given parser backend."""
+    extractor = SeleniumExtractor(parser=parser)
+    title, content, subheadings, element = extractor.extract_content(read_page(name))
+    markdown = extractor.to_markdown(f"https://example.org/{name}", title, content, subheadings, element)
+    return title, content, subheadings, markdown
+
+
+@pytest.mark.parametrize("page", PAGES)
+@pytest.mark.parametrize("parser", [p for p in available_parsers() if p != "html.parser"])
+def test_parser_backend_matches_html_parser(parser, page):
+    """Every parser backend must extract the same title, headings and content as html.parser."""
+    reference = extract("html.parser", page)
+    title, content, subheadings, markdown = extract(parser, page)
+
+    assert title == reference[0]
+    assert subheadings == reference[2]
+    assert content == reference[1]
+    assert markdown == reference[3]
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_sample_pages_have_content(page):
+    """The sample pages must yield a title and some content with the default backend."""
+    title, content, _, _ = extract(None, page)
+
+    assert title
+    assert len(content) > 50
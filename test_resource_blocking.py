@@ -0,0 +1,53 @@
+import re
+import pytest
+from resource_blocking import ResourceBlocker
+
+
+def matches(url, pattern):
+    """Match a URL like Network.setBlockedURLs, where '*' is the only wildcard."""
+    return re.fullmatch('.*'.join(re.escape(part) for part in pattern.split('*')), url) is not None
+
+
+def blocked(blocker, page_url, resource_url):
+    """Tell whether Chrome would block resource_url while loading page_url."""
+    return any(matches(resource_url, pattern) for pattern in blocker.patterns_for(page_url))
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.aviva.fr/assurance-vie",
+    "https://www.gifi.fr/",
+    "https://www.movistar.es/",
+    "https://www.icomos.org/fr",
+    "https://www.oggy.example/episodes",
+    "https://example.com/fonts.woff-guide/",
+    "https://example.com/images.png/index.html",
+    "https://example.com/blog/criteo.com/review",
+    "https://notcriteo.com/",
+])
+def test_documents_are_not_blocked(url):
+    assert not blocked(ResourceBlocker(), url, url)
+
+
+@pytest.mark.parametrize("resource", [
+    "https://cdn.example.com/logo.png",
+    "https://cdn.example.com/photo.jpg?w=640&h=480",
+    "https://cdn.example.com/font.woff2",
+    "https://cdn.example.com/clip.mp4?t=10",
+    "https://www.google-analytics.com/analytics.js",
+    "https://static.criteo.net/js/ld/publishertag.js",
+    "https://criteo.com/sync",
+])
+def test_resources_are_blocked(resource):
+    assert blocked(ResourceBlocker(), "https://www.example.com/article", resource)
+
+
+def test_domain_overrides_allow_types_again():
+    blocker = ResourceBlocker(domain_overrides={"service-public.fr": ["image"]})
+
+    assert not blocked(blocker, "https://www.service-public.fr/particuliers", "https://www.service-public.fr/logo.png")
+    assert blocked(blocker, "https://www.service-public.fr/particuliers", "https://www.service-public.fr/font.woff")
+    assert blocked(blocker, "https://example.com/", "https://example.com/logo.png")
+
+
+def test_empty_blocked_types_block_nothing():
+    assert ResourceBlocker(blocked_types=[]).patterns_for("https://example.com/") == ()
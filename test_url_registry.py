@@ -0,0 +1,85 @@
+import threading
+import pytest
+from url_registry import UrlRegistry, canonicalize_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    # Tracking parameters
+    ("https://example.com/page?utm_source=news&utm_medium=email", "https://example.com/page"),
+    ("https://example.com/page?id=3&fbclid=abc&gclid=def", "https://example.com/page?id=3"),
+    ("https://example.com/page?PK_CAMPAIGN=x&xtor=RSS-1&q=tva", "https://example.com/page?q=tva"),
+    # Default ports, case, fragment
+    ("HTTPS://Example.COM:443/Page#section", "https://example.com/Page"),
+    ("http://example.com:80/", "http://example.com/"),
+    ("http://example.com:8080/", "http://example.com:8080/"),
+    ("https://example.com:80/", "https://example.com:80/"),
+    # Trailing slashes
+    ("https://example.com/docs/", "https://example.com/docs"),
+    ("https://example.com/docs//", "https://example.com/docs"),
+    ("https://example.com", "https://example.com/"),
+    # Query sorting, blank values kept
+    ("https://example.com/search?q=tva&lang=fr&page=", "https://example.com/search?lang=fr&page=&q=tva"),
+    ("https://example.com/search?b=2&a=1&a=0", "https://example.com/search?a=0&a=1&b=2"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_equivalent_urls_share_a_result():
+    registry = UrlRegistry()
+    future, owner = registry.claim("https://example.com/a/?utm_source=x")
+    assert owner
+    registry.resolve("https://example.com/a/?utm_source=x", future, "markdown")
+
+    again, owner = registry.claim("https://EXAMPLE.com/a#top")
+
+    assert not owner
+    assert again.result() == "markdown"
+
+
+def test_concurrent_claims_wait_for_the_url_in_flight():
+    registry = UrlRegistry()
+    future, owner = registry.claim("https://example.com/a")
+    waiting, waiting_owner = registry.claim("https://example.com/a")
+    assert owner and not waiting_owner
+
+    threading.Timer(0.05, registry.resolve, ("https://example.com/a", future, "done")).start()
+
+    assert waiting.result(timeout=5) == "done"
+
+
+def test_failed_urls_are_retried():
+    registry = UrlRegistry()
+    future, _ = registry.claim("https://example.com/a")
+    registry.resolve("https://example.com/a", future, None)
+
+    _, owner = registry.claim("https://example.com/a")
+
+    assert owner
+
+
+def test_least_recently_used_results_are_forgotten():
+    registry = UrlRegistry(max_results=2)
+    for name in "abc":
+        if name == "c":
+            # Touch "a" so that "b" is the least recently used
+            registry.claim("https://example.com/a")
+        future, _ = registry.claim(f"https://example.com/{name}")
+        registry.resolve(f"https://example.com/{name}", future, name)
+
+    assert not registry.claim("https://example.com/a")[1]
+    assert not registry.claim("https://example.com/c")[1]
+    assert registry.claim("https://example.com/b")[1]
+
+
+def test_urls_in_flight_are_never_forgotten():
+    registry = UrlRegistry(max_results=1)
+    pending, _ = registry.claim("https://example.com/pending")
+    for name in "ab":
+        future, _ = registry.claim(f"https://example.com/{name}")
+        registry.resolve(f"https://example.com/{name}", future, name)
+
+    again, owner = registry.claim("https://example.com/pending")
+
+    assert not owner
+    assert again is pending
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+URL canonicalization and a per-session registry of processed URLs.
+Different search queries often return the same page under slightly different URLs
+(tracking parameters, fragments, trailing slashes...). Each canonical URL is processed once
+per session, and concurrent requests for the same URL wait for the fetch already in flight.
+Only the most recently used results are kept, older URLs are processed again (usually from
+the page cache).
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+TRACKING_PARAMS = {
+    "gclid", "gclsrc", "dclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "_hsenc", "_hsmi", "ref_src", "xtor", "xtref", "at_medium", "at_campaign",
+    "at_platform", "at_creation", "at_variant", "at_send_date", "at_recipient_id",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalise a URL so that equivalent URLs compare equal.
+
+    Lower-cases the scheme and host, drops default ports, the fragment, tracking
+    parameters and trailing slashes, and sorts the remaining query parameters.
+
+    Args:
+        url: The URL to normalise
+
+    Returns:
+        The canonical form of the URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    netloc = host
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    params = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query = urlencode(sorted(params))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+class UrlRegistry:
+    """
+    A thread-safe registry mapping canonical URLs to the result of processing them.
+    """
+
+    def __init__(self, max_results: int = 10000):
+        """
+        Initialize an empty UrlRegistry.
+
+        Args:
+            max_results: Number of finished results kept; the least recently used ones are
+                forgotten first (URLs in flight are always kept)
+        """
+        self.max_results = max(1, max_results)
+        self._in_flight: Dict[str, Future] = {}
+        self._results: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, url: str) -> Tuple[Future, bool]:
+        """
+        Look up a URL, registering it if it has not been seen in this session.
+
+        Args:
+            url: The URL about to be processed
+
+        Returns:
+            Tuple of (future holding the result, whether the caller must produce it).
+            When the second item is False, the URL is done or in flight elsewhere
+            and the caller should wait on the future instead.
+        """
+        key = canonicalize_url(url)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = self._results.get(key)
+            if future is not None:
+                self._results.move_to_end(key)
+                return future, False
+            future = self._in_flight[key] = Future()
+            return future, True
+
+    def resolve(self, url: str, future: Future, result):
+        """
+        Publish the result of a claimed URL to everyone waiting on it.
+
+        Failed results (None) are published too, but the URL is forgotten so that
+        a later request retries it.
+        """
+        key = canonicalize_url(url)
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+                if result is not None:
+                    self._results[key] = future
+                    while len(self._results) > self.max_results:
+                        self._results.popitem(last=False)
+        future.set_result(result)
+
+    def clear(self):
+        """Forget every URL, starting a new session."""
+        with self._lock:
+            self._in_flight.clear()
+            self._results.clear()